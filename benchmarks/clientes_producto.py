@@ -0,0 +1,56 @@
+"""
+Benchmark de "analisis.clientes_producto": agregación agrupada frente al bucle original
+(productos x fechas de ingesta).
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.clientes_producto --filas 6000000
+"""
+# Librerías
+import argparse
+import time
+
+import pandas as pd
+
+# Paquetes
+from modules import analisis as anl
+from benchmarks.datos_sinteticos import get_products_sinteticos, LISTA_PRODUCTOS
+
+def clientes_producto_bucle(df_prod):
+    """
+    Implementación original de "clientes_producto" (un filtrado completo del dataset por producto y fecha).
+    """
+    partitions = df_prod['pk_partition'].unique()
+
+    clientes_activos = pd.DataFrame(index=partitions, columns=LISTA_PRODUCTOS)
+    clientes_no_activos = clientes_activos.copy()
+
+    for p in LISTA_PRODUCTOS:
+        for fecha_ingesta in partitions:
+            clientes_activos.loc[fecha_ingesta, p] = df_prod.loc[df_prod['pk_partition']==fecha_ingesta][p].sum()
+            clientes_no_activos.loc[fecha_ingesta, p] = df_prod.loc[df_prod['pk_partition']==fecha_ingesta][p].count() - clientes_activos.loc[fecha_ingesta, p]
+
+    return clientes_activos, clientes_no_activos
+
+def medir(funcion, df_prod):
+    inicio = time.perf_counter()
+    resultado = funcion(df_prod)
+    return resultado, time.perf_counter() - inicio
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, default=6_000_000, help='Número de filas del dataset sintético')
+    args = parser.parse_args()
+
+    print(f'Generando dataset sintético ({args.filas} filas)...')
+    df_prod = get_products_sinteticos(args.filas)
+
+    (activos_bucle, no_activos_bucle), t_bucle = medir(clientes_producto_bucle, df_prod)
+    (activos, no_activos), t_agrupado = medir(anl.clientes_producto, df_prod)
+
+    # Comprobar que ambas implementaciones coinciden
+    assert (activos_bucle.astype('int64').values == activos.values).all()
+    assert (no_activos_bucle.astype('int64').values == no_activos.values).all()
+
+    print(f'\tBucle original: {t_bucle:.2f} s')
+    print(f'\tAgregación agrupada: {t_agrupado:.2f} s')
+    print(f'\tMejora: x{t_bucle / t_agrupado:.1f}')
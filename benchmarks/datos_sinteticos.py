@@ -0,0 +1,105 @@
+"""
+Generación de datasets sintéticos con la estructura de products_df.csv para medir el rendimiento
+de las funciones del paquete "modules".
+"""
+# Librerías
+import numpy as np
+import pandas as pd
+
+LISTA_PRODUCTOS = [
+    'short_term_deposit', 'loans', 'mortgage', 'funds', 'securities',
+    'long_term_deposit', 'em_account_pp', 'credit_card', 'payroll',
+    'pension_plan', 'payroll_account', 'emc_account', 'debit_card',
+    'em_account_p', 'em_account'
+]
+
+def get_products_sinteticos(num_filas, num_particiones=17, semilla=0):
+    """
+    Crea un dataset de productos sintético con el formato de salida de "get_products_df".
+
+    Args:
+    -----
+    num_filas [{int}] -- Número aproximado de filas del dataset.
+    num_particiones [{int}] -- Número de fechas de ingesta.
+    semilla [{int}] -- Semilla del generador aleatorio.
+
+    Returns:
+    ------
+    df_prod [{pandas.DataFrame}] -- Dataset de productos ordenado por fecha de ingesta.
+    """
+    rng = np.random.default_rng(semilla)
+
+    # Fechas de ingesta (día 28 de cada mes)
+    particiones = pd.date_range('2018-01-01', periods=num_particiones, freq='MS') + pd.Timedelta(days=27)
+
+    # Cada cliente aparece en un número aleatorio de meses
+    num_clientes = max(1, int(num_filas / (0.6 * num_particiones)))
+    presencia = rng.random((num_particiones, num_clientes)) < 0.6
+    codigo_particion, codigo_cliente = np.nonzero(presencia)
+
+    df_prod = pd.DataFrame({
+        'pk_cid': (codigo_cliente + 15000).astype(str),
+        'pk_partition': particiones[codigo_particion],
+    })
+
+    # Estado de cada producto (probabilidad de contratación distinta por producto)
+    probabilidad = rng.random(len(LISTA_PRODUCTOS)) * 0.3
+    estados = rng.random((len(df_prod), len(LISTA_PRODUCTOS))) < probabilidad
+    for i, producto in enumerate(LISTA_PRODUCTOS):
+        df_prod[producto] = estados[:, i].astype(float)
+
+    return df_prod
+
+def get_commercial_activity_sinteticos(df_prod, semilla=0):
+    """
+    Crea un dataset de actividad comercial sintético (formato de "get_commercial_activity_df") con una fila por
+    cliente y fecha de ingesta de "df_prod".
+
+    Args:
+    -----
+    df_prod [{pandas.DataFrame}] -- Dataset de productos sintético (ver "get_products_sinteticos").
+    semilla [{int}] -- Semilla del generador aleatorio.
+
+    Returns:
+    ------
+    df_comm [{pandas.DataFrame}] -- Dataset de actividad comercial.
+    """
+    rng = np.random.default_rng(semilla)
+    num_filas = len(df_prod)
+
+    return pd.DataFrame({
+        'pk_cid': df_prod['pk_cid'].to_numpy(),
+        'pk_partition': df_prod['pk_partition'].to_numpy(),
+        'entry_date': pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 1600, num_filas), unit='D'),
+        'entry_channel': rng.choice(['KHE', 'KFC', 'KHQ', 'KAT', 'RED'], num_filas),
+        'active_customer': rng.integers(0, 2, num_filas).astype(float),
+        'segment': rng.choice(['01 - TOP', '02 - PARTICULARES', '03 - UNIVERSITARIO'], num_filas),
+    })
+
+def get_sociodemographic_sinteticos(df_prod, semilla=0):
+    """
+    Crea un dataset sociodemográfico sintético (formato de "get_sociodemographic_df") con una fila por cliente y
+    fecha de ingesta de "df_prod".
+
+    Args:
+    -----
+    df_prod [{pandas.DataFrame}] -- Dataset de productos sintético (ver "get_products_sinteticos").
+    semilla [{int}] -- Semilla del generador aleatorio.
+
+    Returns:
+    ------
+    df_sd [{pandas.DataFrame}] -- Dataset sociodemográfico.
+    """
+    rng = np.random.default_rng(semilla)
+    num_filas = len(df_prod)
+
+    return pd.DataFrame({
+        'pk_cid': df_prod['pk_cid'].to_numpy(),
+        'pk_partition': df_prod['pk_partition'].to_numpy(),
+        'country_id': 'ES',
+        'region_code': rng.integers(1, 53, num_filas).astype(str),
+        'gender': rng.choice(['H', 'V'], num_filas),
+        'age': rng.integers(18, 90, num_filas),
+        'deceased': 'N',
+        'salary': rng.normal(90000, 30000, num_filas),
+    })
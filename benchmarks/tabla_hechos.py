@@ -0,0 +1,64 @@
+"""
+Benchmark de "analisis.tabla_hechos_clientes": merge-join sobre claves enteras (cliente, mes) ordenadas con
+proyección de columnas frente a la cadena de pandas.merge de los tres datasets.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.tabla_hechos --filas 6000000
+"""
+# Librerías
+import argparse
+import time
+
+import pandas as pd
+
+# Paquetes
+from modules import analisis as anl
+from benchmarks.datos_sinteticos import get_products_sinteticos, get_commercial_activity_sinteticos, \
+    get_sociodemographic_sinteticos
+
+CLAVES = ['pk_cid', 'pk_partition']
+
+def merge_pandas(df_prod, df_comm, df_sd):
+    """
+    Unión de los tres datasets con pandas.merge (implementación de referencia).
+    """
+    return df_prod.merge(df_comm, on=CLAVES).merge(df_sd, on=CLAVES)
+
+def medir(funcion, *args, **kwargs):
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    return resultado, time.perf_counter() - inicio
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, default=6_000_000, help='Número de filas del dataset sintético')
+    args = parser.parse_args()
+
+    print(f'Generando datasets sintéticos ({args.filas} filas)...')
+    df_prod = get_products_sinteticos(args.filas)
+    # Los datasets de actividad comercial y sociodemográfico se desordenan y se elimina un 5% de sus filas
+    df_comm = get_commercial_activity_sinteticos(df_prod).sample(frac=0.95, random_state=1)
+    df_sd = get_sociodemographic_sinteticos(df_prod).sample(frac=0.95, random_state=2)
+
+    # pk_cid como texto (formato actual de los cargadores)
+    _, t_texto = medir(merge_pandas, df_prod, df_comm, df_sd)
+
+    # pk_cid codificado con el diccionario de clientes compartido
+    clientes = anl.crear_diccionario_clientes(df_prod['pk_cid'], df_comm['pk_cid'], df_sd['pk_cid'])
+    for df in [df_prod, df_comm, df_sd]:
+        df['pk_cid'] = anl.codificar_clientes(df['pk_cid'], clientes)
+
+    referencia, t_entero = medir(merge_pandas, df_prod, df_comm, df_sd)
+    hechos, t_hechos = medir(anl.tabla_hechos_clientes, df_prod, df_comm, df_sd)
+    _, t_proyeccion = medir(anl.tabla_hechos_clientes, df_prod, df_comm, df_sd, columnas_prod=['payroll'],
+                            columnas_comm=['segment'], columnas_sd=['age'])
+
+    # Comprobar que ambas implementaciones coinciden
+    referencia = referencia.sort_values(CLAVES, ignore_index=True)
+    hechos = hechos.drop(columns='indice_mes')
+    pd.testing.assert_frame_equal(referencia[hechos.columns], hechos, check_dtype=False)
+
+    print(f'\tpandas.merge (pk_cid texto): {t_texto:.2f} s')
+    print(f'\tpandas.merge (pk_cid entero): {t_entero:.2f} s')
+    print(f'\tTabla de hechos (todas las columnas): {t_hechos:.2f} s (x{t_entero / t_hechos:.1f})')
+    print(f'\tTabla de hechos (3 columnas): {t_proyeccion:.2f} s (x{t_entero / t_proyeccion:.1f})')
@@ -0,0 +1,42 @@
+"""
+Benchmark de "analisis.valorar_productos_clientes_paralelo": valoración por shards de clientes en un pool de procesos
+frente a la valoración en un único proceso.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.valoracion_clientes --filas 6000000 --workers 1 2 4 8 16 32
+"""
+# Librerías
+import argparse
+import time
+
+import pandas as pd
+
+# Paquetes
+from modules import analisis as anl
+from benchmarks.datos_sinteticos import get_products_sinteticos, LISTA_PRODUCTOS
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, default=6_000_000, help='Número de filas del dataset sintético')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='Número de procesos a medir')
+    args = parser.parse_args()
+
+    print(f'Generando dataset sintético ({args.filas} filas)...')
+    df_prod = get_products_sinteticos(args.filas)
+
+    inicio = time.perf_counter()
+    valoracion = anl.valorar_productos_clientes(df_prod, LISTA_PRODUCTOS, show_msg=False)
+    t_serie = time.perf_counter() - inicio
+    print(f'\tUn proceso: {t_serie:.2f} s')
+
+    for num_workers in args.workers:
+        inicio = time.perf_counter()
+        valoracion_paralelo, tiempos = anl.valorar_productos_clientes_paralelo(
+            df_prod, LISTA_PRODUCTOS, num_workers=num_workers, show_msg=False)
+        t_paralelo = time.perf_counter() - inicio
+
+        # Comprobar que ambas ejecuciones coinciden
+        pd.testing.assert_frame_equal(valoracion, valoracion_paralelo)
+
+        print(f'\t{num_workers} procesos: {t_paralelo:.2f} s (x{t_serie / t_paralelo:.1f}) | '
+              f'shard más lento: {tiempos["segundos"].max():.2f} s')
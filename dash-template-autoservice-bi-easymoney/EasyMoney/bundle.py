@@ -0,0 +1,146 @@
+"""
+Paquete de datos del panel de Autoservicio BI.
+
+Reúne en un único fichero binario todo lo que necesita el panel (nivel de permanencia ya agregado, información de
+clientes y productos, clientes activos, listado de productos y contribución de cada producto), de forma que el
+arranque de cada worker consiste en una única lectura pequeña.
+
+Construcción del paquete (desde el directorio del panel):
+    python -m EasyMoney.bundle
+"""
+# Librerías
+import os
+import pickle
+import tempfile
+from datetime import datetime
+from functools import lru_cache
+import pandas as pd
+
+# Paquetes
+from EasyMoney import analisis as anl
+from EasyMoney.seleccion import get_contribucion_productos, solo_lectura
+
+# Versión del formato del paquete (cambiar si cambia su contenido)
+VERSION_BUNDLE = 2
+
+DATA_DIR = 'data'
+BUNDLE_FILENAME = os.path.join(DATA_DIR, 'dashboard_bundle.pkl')
+
+# Ficheros de origen del paquete
+FUENTES = {
+    'nivel_permanencia': 'nivel_permanencia.csv',
+    'informacion_clientes_con_producto': 'informacion_clientes_con_producto.csv',
+    'clientes_activos': 'clientes_activos.csv',
+    'lista_productos': 'lista_productos.csv',
+}
+
+def get_version(data_dir=DATA_DIR):
+    """
+    Sello de versión del paquete: versión del formato, versión de pandas (el paquete almacena objetos de pandas) y
+    fecha de modificación de los ficheros de origen.
+
+    Args:
+        data_dir [{str}] -- Directorio de los ficheros csv.
+
+    Returns:
+        version [{dict}] -- Sello de versión.
+    """
+    fuentes = dict()
+    for nombre, filename in FUENTES.items():
+        filename_dir = os.path.join(data_dir, filename)
+        fuentes[nombre] = os.stat(filename_dir).st_mtime_ns if os.path.exists(filename_dir) else None
+
+    return {
+        'formato': VERSION_BUNDLE,
+        'pandas': pd.__version__,
+        'fuentes': fuentes,
+    }
+
+def build_bundle(data_dir=DATA_DIR, filename=BUNDLE_FILENAME):
+    """
+    Construye el paquete de datos del panel a partir de los ficheros csv del análisis.
+
+    Args:
+        data_dir [{str}] -- Directorio de los ficheros csv.
+        filename [{str}] -- Directorio del paquete de datos.
+
+    Returns:
+        bundle [{dict}] -- Paquete de datos.
+    """
+    print('Building data bundle...')
+
+    # Nivel de permanencia (agregado por región)
+    df_bar = anl.get_nivel_permanencia(filename=os.path.join(data_dir, FUENTES['nivel_permanencia']))
+
+    # Información de productos contratados (estado igual a 1) por mes de ingesta y número total clientes.
+    df_cpi_clientes, df_cpi_productos, df_cpi_ratios = anl.get_informacion_clientes_producto(
+        filename=os.path.join(data_dir, FUENTES['informacion_clientes_con_producto']))
+    clientes_activos = anl.get_clientes_activos(os.path.join(data_dir, FUENTES['clientes_activos']))
+    lista_productos = anl.get_lista_productos(filename=os.path.join(data_dir, FUENTES['lista_productos']))
+
+    # Contribución de cada producto (métricas de cualquier selección de productos)
+    contribucion = get_contribucion_productos(clientes_activos, df_cpi_clientes, df_cpi_productos, lista_productos)
+
+    bundle = {
+        'version': get_version(data_dir),
+        'fecha_creacion': datetime.now().isoformat(timespec='seconds'),
+        'df_bar': df_bar,
+        'clientes_activos': clientes_activos,
+        'df_cpi_clientes': df_cpi_clientes,
+        'df_cpi_productos': df_cpi_productos,
+        'df_cpi_ratios': df_cpi_ratios,
+        'lista_productos': lista_productos,
+        'contribucion': contribucion,
+    }
+
+    # Escritura atómica: otros workers (o arranques concurrentes) nunca leen un paquete a medio escribir.
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.chmod(tmp, 0o644)  # mkstemp crea el fichero con permisos 0600
+        os.replace(tmp, filename)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+    return bundle
+
+@lru_cache(maxsize=None)
+def get_bundle(data_dir=DATA_DIR, filename=BUNDLE_FILENAME):
+    """
+    Lectura del paquete de datos del panel. El resultado se mantiene en memoria, de forma que los distintos
+    componentes del panel (datos y controles) comparten una única lectura, que no debe modificarse. Si el paquete
+    no existe o su sello de versión no coincide con el de los ficheros de origen, se vuelve a construir.
+
+    Args:
+        data_dir [{str}] -- Directorio de los ficheros csv.
+        filename [{str}] -- Directorio del paquete de datos.
+
+    Returns:
+        bundle [{dict}] -- Paquete de datos.
+    """
+    try:
+        with open(filename, 'rb') as f:
+            bundle = pickle.load(f)
+    except Exception as e:
+        print(f'No se pudo acceder al paquete de datos!\n{e}')
+        return build_bundle(data_dir=data_dir, filename=filename)
+
+    version = get_version(data_dir)
+    # Sin ficheros de origen (p.ej. despliegue solo con el paquete) se acepta el paquete existente.
+    if not any(version['fuentes'].values()):
+        version['fuentes'] = bundle['version']['fuentes']
+
+    if bundle['version'] != version:
+        print('Paquete de datos desactualizado.')
+        return build_bundle(data_dir=data_dir, filename=filename)
+
+    # El paquete se comparte entre hilos: la contribución se marca de nuevo como solo lectura tras la lectura.
+    solo_lectura(bundle['contribucion'])
+
+    return bundle
+
+if __name__ == '__main__':
+    bundle = build_bundle()
+    print(f"Paquete de datos: {BUNDLE_FILENAME} ({os.path.getsize(BUNDLE_FILENAME)} bytes)")
@@ -0,0 +1,124 @@
+# Librerías
+import numpy as np
+import pandas as pd
+
+def get_contribucion_productos(clientes_activos, df_cpi_clientes, df_cpi_productos, lista_productos):
+    """
+    Precalcula la contribución de cada producto a los productos contratados y a los nuevos productos de cada mes de
+    ingesta. Con ella, las métricas de cualquier selección de productos se obtienen con un único producto
+    matriz-vector (ver "metricas_seleccion"):
+
+        productos_contratados = base + C · m
+        nuevos_productos = base_nuevos + ΔC · m
+
+    siendo C la matriz (meses x productos) de clientes activos, ΔC su diferencia mensual y m el vector 0/1 de
+    productos seleccionados.
+
+    Args:
+        clientes_activos [{pandas.DataFrame}] -- Clientes con servicios en estado igual a 1 por mes y producto.
+        df_cpi_clientes [{pandas.DataFrame}] -- Información de clientes (numero_clientes, nuevos_clientes, ...).
+        df_cpi_productos [{pandas.DataFrame}] -- Información de productos (productos_contratados, ...).
+        lista_productos [{list}] -- Listado de productos (el producto i corresponde con el bit i de la máscara).
+
+    Returns:
+        contribucion [{dict}] -- Matriz de contribución y vectores base por mes de ingesta.
+    """
+    index = df_cpi_productos.index
+    matriz = clientes_activos.reindex(index)[lista_productos].to_numpy(dtype=float)
+    productos_contratados = df_cpi_productos['productos_contratados'].to_numpy(dtype=float)
+
+    # Diferencia mensual (el primer mes no tiene mes anterior: 0)
+    matriz_nuevos = np.zeros_like(matriz)
+    matriz_nuevos[1:] = np.diff(matriz, axis=0)
+
+    base = productos_contratados - matriz.sum(axis=1)
+    base_nuevos = np.zeros_like(base)
+    base_nuevos[1:] = np.diff(base)
+
+    contribucion = {
+        'index': index,
+        'lista_productos': tuple(lista_productos),
+        'matriz': np.vstack([matriz, matriz_nuevos]),
+        'base': np.concatenate([base, base_nuevos]),
+        'numero_clientes': df_cpi_clientes['numero_clientes'].reindex(index).to_numpy(dtype=float),
+        'nuevos_clientes': df_cpi_clientes['nuevos_clientes'].reindex(index).to_numpy(dtype=float),
+    }
+
+    return solo_lectura(contribucion)
+
+def solo_lectura(contribucion):
+    """
+    Marca como no modificables los vectores y la matriz de contribución, de forma que puedan compartirse entre hilos
+    sin copias (cualquier intento de escritura produce un error en lugar de modificar los datos compartidos).
+
+    Args:
+        contribucion [{dict}] -- Contribución de los productos (ver "get_contribucion_productos").
+
+    Returns:
+        contribucion [{dict}] -- Contribución de los productos (solo lectura).
+    """
+    for clave in ['matriz', 'base', 'numero_clientes', 'nuevos_clientes']:
+        contribucion[clave].setflags(write=False)
+
+    return contribucion
+
+def mascara_productos(lista_productos, productos_seleccionados):
+    """
+    Máscara de bits de una selección de productos: el bit i indica si lista_productos[i] está seleccionado.
+
+    Args:
+        lista_productos [{list}] -- Listado de productos.
+        productos_seleccionados [{list}] -- Productos seleccionados.
+
+    Returns:
+        mascara [{int}] -- Máscara de la selección.
+    """
+    seleccion = set(productos_seleccionados)
+    mascara = 0
+    for i, producto in enumerate(lista_productos):
+        if producto in seleccion:
+            mascara |= 1 << i
+
+    return mascara
+
+def metricas_seleccion(contribucion, mascara):
+    """
+    Número de clientes, productos contratados, nuevos productos y ratios producto-cliente por mes de ingesta para
+    una selección de productos.
+
+    Args:
+        contribucion [{dict}] -- Contribución de los productos (ver "get_contribucion_productos").
+        mascara [{int}] -- Máscara de la selección (ver "mascara_productos").
+
+    Returns:
+        metricas [{pandas.DataFrame}] -- Métricas por mes de ingesta (nuevo DataFrame, sin datos compartidos): numero_clientes, nuevos_clientes,
+                                         productos_contratados, nuevos_productos, producto_cliente_ratio y
+                                         nuevos_producto_cliente_ratio.
+    """
+    num_productos = len(contribucion['lista_productos'])
+    seleccion = (mascara >> np.arange(num_productos)) & 1
+
+    # Productos contratados y nuevos productos (un único producto matriz-vector)
+    productos = contribucion['base'] + contribucion['matriz'] @ seleccion
+    productos_contratados, nuevos_productos = np.split(productos, 2)
+
+    numero_clientes = contribucion['numero_clientes']
+    nuevos_clientes = contribucion['nuevos_clientes']
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        producto_cliente_ratio = productos_contratados / numero_clientes
+        nuevos_producto_cliente_ratio = nuevos_productos / nuevos_clientes
+
+    metricas = pd.DataFrame(
+        {
+            'numero_clientes': numero_clientes.copy(),
+            'nuevos_clientes': nuevos_clientes.copy(),
+            'productos_contratados': productos_contratados,
+            'nuevos_productos': nuevos_productos,
+            'producto_cliente_ratio': producto_cliente_ratio,
+            'nuevos_producto_cliente_ratio': np.where(np.isnan(nuevos_producto_cliente_ratio), 0, nuevos_producto_cliente_ratio),
+        },
+        index=contribucion['index']
+    )
+
+    return metricas
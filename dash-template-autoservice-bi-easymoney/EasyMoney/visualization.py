@@ -74,17 +74,15 @@ def bar_nivel_permanencia(df_bar, plot=True):
     else:
         return fig
 
-def scatter_clientes_productos(clientes_productos_contratados, clientes_activos, productos_seleccionados, show_fig=True):
+def scatter_clientes_productos(metricas, show_fig=True):
     """
     Visualización temporal del número de clientes con servicio contratado
     y número de productos contratados.
-    """
-
-    productos_no_seleccionados = [p for p in clientes_activos.columns.to_list() if p not in productos_seleccionados]
 
-    if len(productos_no_seleccionados) != 0:
-        # Productos activos por fecha.
-        clientes_productos_contratados['productos_contratados'] = clientes_productos_contratados['productos_contratados'] - clientes_activos[productos_no_seleccionados].sum(axis=1)
+    Args:
+        metricas [{pandas.DataFrame}] -- Métricas de la selección de productos (ver "seleccion.metricas_seleccion").
+    """
+    clientes_productos_contratados = metricas
 
     fig = go.Figure()
 
@@ -130,23 +128,14 @@ def scatter_clientes_productos(clientes_productos_contratados, clientes_activos,
         return fig
 
 
-def bar_nuevos_clientes_productos(nuevos_clientes_productos,
-                                  clientes_productos_contratados,
-                                  clientes_activos,
-                                  productos_seleccionados,
-                                  show_fig=True):
+def bar_nuevos_clientes_productos(metricas, show_fig=True):
     """
+    Visualización de los nuevos clientes y nuevos productos contratados por mes.
 
+    Args:
+        metricas [{pandas.DataFrame}] -- Métricas de la selección de productos (ver "seleccion.metricas_seleccion").
     """
-
-    productos_no_seleccionados = [p for p in clientes_activos.columns.to_list() if p not in productos_seleccionados]
-
-    if len(productos_no_seleccionados) != 0:
-        # Productos activos por fecha.
-        clientes_productos_contratados['productos_contratados'] = clientes_productos_contratados['productos_contratados'] - clientes_activos[productos_no_seleccionados].sum(axis=1)
-
-        # Productos nuevos contratados.
-        nuevos_clientes_productos['nuevos_productos'] = (clientes_productos_contratados['productos_contratados'] - clientes_productos_contratados['productos_contratados'].shift(1)).fillna(0)
+    nuevos_clientes_productos = metricas
 
     fig = go.Figure()
 
@@ -191,29 +180,14 @@ def bar_nuevos_clientes_productos(nuevos_clientes_productos,
         return fig
 
 
-def bar_clientes_productos_ratio(clientes_productos_ratio,
-                                 nuevos_clientes_productos,
-                                 clientes_productos_contratados,
-                                 clientes_activos,
-                                 productos_seleccionados,
-                                 show_fig=True):
+def bar_clientes_productos_ratio(metricas, show_fig=True):
     """
+    Visualización de los ratios producto - cliente y nuevos productos - nuevos clientes por mes.
 
+    Args:
+        metricas [{pandas.DataFrame}] -- Métricas de la selección de productos (ver "seleccion.metricas_seleccion").
     """
-    productos_no_seleccionados = [p for p in clientes_activos.columns.to_list() if p not in productos_seleccionados]
-
-    if len(productos_no_seleccionados) != 0:
-        # Productos activos por fecha.
-        clientes_productos_contratados['productos_contratados'] = clientes_productos_contratados['productos_contratados'] - clientes_activos[productos_no_seleccionados].sum(axis=1)
-
-        # Productos nuevos contratados.
-        nuevos_clientes_productos['nuevos_productos'] = (clientes_productos_contratados['productos_contratados'] - clientes_productos_contratados['productos_contratados'].shift(1)).fillna(0)
-
-        # Ratio de productos respecto a numero de clientes
-        clientes_productos_ratio['producto_cliente_ratio'] = clientes_productos_contratados['productos_contratados'] / clientes_productos_contratados['numero_clientes']
-
-        # Ratio de nuevos productos respecto a nuevo número de clientes
-        clientes_productos_ratio['nuevos_producto_cliente_ratio'] = (nuevos_clientes_productos['nuevos_productos']/nuevos_clientes_productos['nuevos_clientes']).fillna(0)
+    clientes_productos_ratio = metricas
 
     fig = go.Figure()
 
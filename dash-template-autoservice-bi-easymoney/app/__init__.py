@@ -1,41 +1,66 @@
 # Librerías
-print('Importing libs...')
+from functools import lru_cache
 import dash
 import dash_bootstrap_components as dbc
 from dash import html
 
 # Paquetes
-print('Importing pkgs...')
 from app.styles import get_styles
 from app.forms import get_sidebar, get_client_content
-from EasyMoney import analisis as anl
+from app.utils import serializar_componente
+from app.cache import StaticFigures
+from EasyMoney.bundle import get_bundle
 
 # 1. Obtener componentes de la página.
 sidebar_style, content_style, text_style, card_text_style = get_styles() # estilos
 
-# 2. Importar componentes de la página.
-sidebar = get_sidebar() # Barra de controles.
-client_content = get_client_content()  # Contenido de visualización de la página.
-product_content = get_client_content()  # Contenido de visualización de la página.
-segmentacion_content = get_client_content()  # Contenido de visualización de la página.
-ai_content = get_client_content()  # Contenido de visualización de la página.
+# 2. Componentes de la página (se construyen bajo demanda, la primera vez que se solicitan).
+
+# Secciones de la página (valor del radio_items -> nombre de la sección)
+secciones = {
+    'radioitems_value1': 'Clientes',
+    'radioitems_value2': 'Productos',
+    'radioitems_value3': 'Segmentación',
+    'radioitems_value4': 'Aprendizaje Automático',
+}
+base_title = 'Easy Money Autoservice BI'
+
+def get_bar_nivel_permanencia():
+    # Importación diferida: plotly solo se carga al construir la figura.
+    from EasyMoney import visualization as vs
+    return vs.bar_nivel_permanencia(df_bar=get_bundle()['df_bar'], plot=False)
+
+# Figuras estáticas: no dependen de los controles, se construyen una única vez y se incluyen en el contenido.
+static_figures = StaticFigures()
+static_figures.add('graph_6', get_bar_nivel_permanencia)
+
+@lru_cache(maxsize=None)
+def get_section_content(radio_items_value):
+    """
+    Contenido serializado de la sección seleccionada. Cada sección se construye y serializa una única vez (la
+    primera vez que se solicita): después, cambiar de sección es una consulta a un diccionario.
+    """
+    content = get_client_content(base_title + ' - ' + secciones[radio_items_value])  # Contenido de visualización de la página.
+    return static_figures.embed(serializar_componente(content))
+
+@lru_cache(maxsize=None)
+def get_layout():
+    """ Layout de la web (fijo: las secciones se intercambian dentro de "page_content") """
+    sidebar = get_sidebar() # Barra de controles.
+    return html.Div([sidebar, html.Div(get_section_content('radioitems_value1'), id='page_content')])
 
 # 3. Inicializar aplicación
 external_stylesheets = [dbc.themes.BOOTSTRAP, 'https://codepen.io/chriddyp/pen/bWLwgP.css']
-easymoney_app = dash.Dash('Easy Money',external_stylesheets=external_stylesheets)
+# Las secciones se intercambian mediante callbacks y el layout es una función: Dash no valida los callbacks contra
+# el layout al arrancar (lo que obligaría a construirlo).
+easymoney_app = dash.Dash('Easy Money',external_stylesheets=external_stylesheets, suppress_callback_exceptions=True)
 
-# 4. Establecer layout de la web
-easymoney_app.layout = html.Div([sidebar, client_content])# 4. Establecer layout de la web
-easymoney_app.layout = html.Div([sidebar, client_content])
+# 4. Establecer layout de la web (se construye en la primera petición, no al importar el paquete)
+easymoney_app.layout = get_layout
 
 def get_data():
-    """ Lectura de datasets """
-    # Nivel de permanencia
-    df_bar = anl.get_nivel_permanencia(filename='data/nivel_permanencia.csv')
-
-    # Información de productos contratados (estado igual a 1) por mes de ingesta y número total clientes.
-    df_cpi_clientes, df_cpi_productos, df_cpi_ratios = anl.get_informacion_clientes_producto(filename='data/informacion_clientes_con_producto.csv')
-    clientes_activos = anl.get_clientes_activos('data/clientes_activos.csv')
-    lista_productos = anl.get_lista_productos(filename='data/lista_productos.csv')
+    """ Lectura de datasets (paquete de datos precalculado, ver EasyMoney.bundle) """
+    bundle = get_bundle()
 
-    return df_bar, clientes_activos, df_cpi_clientes, df_cpi_productos, df_cpi_ratios, lista_productos#df_cpi_clientes, df_cpi_productos, df_cpi_ratios
\ No newline at end of file
+    return (bundle['df_bar'], bundle['clientes_activos'], bundle['df_cpi_clientes'], bundle['df_cpi_productos'],
+            bundle['df_cpi_ratios'], bundle['lista_productos'])
\ No newline at end of file
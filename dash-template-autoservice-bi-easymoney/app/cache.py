@@ -0,0 +1,244 @@
+"""
+Caché de figuras de la aplicación.
+
+Las figuras que dependen de la selección de productos se almacenan serializadas (JSON de plotly) en una caché LRU
+en memoria y en un almacén en disco local compartido por todos los workers (gunicorn) de la misma máquina.
+
+Las figuras estáticas (no dependen de los controles) se construyen y serializan una única vez al arrancar y se
+incluyen directamente en el layout, sin callback.
+"""
+# Librerías
+import os
+import re
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+# Directorio por defecto del almacén en disco
+FIGURE_CACHE_DIR = os.environ.get('FIGURE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'easymoney_figure_cache'))
+
+def version_codigo(*filenames):
+    """
+    Versión del código que construye las figuras: hash del contenido de los ficheros fuente indicados. Un despliegue
+    que modifica alguno de ellos invalida las figuras almacenadas en disco.
+
+    Args:
+        filenames [{str}] -- Ficheros fuente (p.ej. EasyMoney/visualization.py).
+
+    Returns:
+        version [{str}] -- Hash sha1 del contenido de los ficheros.
+    """
+    sha1 = hashlib.sha1()
+    for filename in filenames:
+        with open(filename, 'rb') as f:
+            sha1.update(f.read())
+
+    return sha1.hexdigest()
+
+class FigureCache:
+    """
+    Caché LRU de figuras serializadas indexada por (nombre de la figura, selección de productos ordenada).
+
+    Args:
+        version [{str}] -- Versión de los datos. Las figuras de versiones distintas se almacenan por separado.
+        version_codigo [{str}] -- Versión del código de las figuras (ver "version_codigo"). Forma parte, junto con
+                                  la versión de los datos, del espacio de nombres del almacén en disco.
+        maxsize [{int}] -- Número máximo de figuras en memoria.
+        cache_dir [{str}] -- Directorio del almacén en disco (None para desactivarlo).
+        max_disk [{int}] -- Número máximo de figuras en disco (se comprueba cada max_disk // 16 escrituras de cada
+                            worker, de forma que puede superarse temporalmente).
+    """
+
+    def __init__(self, version='', version_codigo='', maxsize=256, cache_dir=FIGURE_CACHE_DIR, max_disk=4096):
+        self.maxsize = maxsize
+        self.max_disk = max_disk
+        self.intervalo_limpieza = max(1, max_disk // 16)
+        self.cache_dir = None
+        if cache_dir is not None:
+            version_hash = hashlib.sha1(f'{version}|{version_codigo}'.encode('utf-8')).hexdigest()[:12]
+            self.cache_dir = os.path.join(cache_dir, version_hash)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._limpiar_versiones(cache_dir, version_hash)
+
+        self._figuras = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._escrituras = 0
+
+    @staticmethod
+    def get_key(nombre, productos):
+        """ Clave normalizada: la selección de productos se ordena para que el orden de selección no influya. """
+        seleccion = ','.join(sorted(productos))
+        return nombre + '-' + hashlib.sha1(seleccion.encode('utf-8')).hexdigest()
+
+    def get(self, nombre, productos):
+        """
+        Figura almacenada (dict) o None si no está en la caché.
+        """
+        key = self.get_key(nombre, productos)
+
+        with self._lock:
+            figura_json = self._figuras.get(key)
+            if figura_json is not None:
+                self._figuras.move_to_end(key)
+                self.hits += 1
+                return json.loads(figura_json)
+
+        figura_json = self._leer_disco(key)
+        if figura_json is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+            self._guardar_memoria(key, figura_json)
+
+        return json.loads(figura_json)
+
+    def set(self, nombre, productos, fig):
+        """
+        Almacena una figura (plotly.graph_objects.Figure) y devuelve su versión serializada (dict).
+        """
+        key = self.get_key(nombre, productos)
+        figura_json = fig.to_json()
+
+        with self._lock:
+            self._guardar_memoria(key, figura_json)
+        self._escribir_disco(key, figura_json)
+
+        return json.loads(figura_json)
+
+    def get_or_build(self, nombre, productos, build):
+        """
+        Figura de la caché o, si no existe, la construye con "build" (función sin argumentos) y la almacena.
+        """
+        figura = self.get(nombre, productos)
+        if figura is None:
+            figura = self.set(nombre, productos, build())
+
+        return figura
+
+    def stats(self):
+        """ Contadores de aciertos (memoria y disco) y fallos. """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'size': len(self._figuras),
+                'maxsize': self.maxsize,
+            }
+
+    def _guardar_memoria(self, key, figura_json):
+        self._figuras[key] = figura_json
+        self._figuras.move_to_end(key)
+        while len(self._figuras) > self.maxsize:
+            self._figuras.popitem(last=False)
+
+    def _leer_disco(self, key):
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, key + '.json'), encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _escribir_disco(self, key, figura_json):
+        if self.cache_dir is None:
+            return
+
+        # Escritura atómica: otros workers nunca leen un fichero a medio escribir. Si el directorio ya no existe
+        # (p.ej. lo ha eliminado un worker de una versión nueva), la figura solo se mantiene en memoria.
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        except OSError:
+            return
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(figura_json)
+        try:
+            os.replace(tmp, os.path.join(self.cache_dir, key + '.json'))
+        except OSError:
+            return
+
+        # El directorio solo se recorre cada "intervalo_limpieza" escrituras (no en cada escritura)
+        with self._lock:
+            self._escrituras += 1
+            limpiar = self._escrituras % self.intervalo_limpieza == 0
+        if limpiar:
+            self._limpiar_disco()
+
+    @staticmethod
+    def _limpiar_versiones(cache_dir, version_hash):
+        """
+        Elimina los directorios de versiones anteriores (datos o código) del almacén en disco: sus figuras ya no se
+        sirven. Solo se eliminan directorios con nombre de versión (hash de 12 caracteres hexadecimales).
+        """
+        try:
+            for entrada in os.scandir(cache_dir):
+                if entrada.is_dir() and entrada.name != version_hash and re.fullmatch(r'[0-9a-f]{12}', entrada.name):
+                    shutil.rmtree(entrada.path, ignore_errors=True)
+        except OSError:
+            pass
+
+    def _limpiar_disco(self):
+        """ Elimina las figuras más antiguas del disco si se supera max_disk. """
+        try:
+            ficheros = [entrada for entrada in os.scandir(self.cache_dir) if entrada.name.endswith('.json')]
+            if len(ficheros) <= self.max_disk:
+                return
+            ficheros.sort(key=lambda entrada: entrada.stat().st_mtime)
+            for entrada in ficheros[:len(ficheros) - self.max_disk]:
+                os.remove(entrada.path)
+        except OSError:
+            pass
+
+
+class StaticFigures:
+    """
+    Registro de figuras estáticas indexadas por el id de su dcc.Graph. Cada figura se construye y serializa una única
+    vez (al llamar a "build") y se inserta en el contenido serializado de la página (ver "embed").
+    """
+
+    def __init__(self):
+        self._builders = OrderedDict()
+        self._figuras = None
+
+    def add(self, graph_id, build):
+        """
+        Marca como estática la figura del dcc.Graph "graph_id". "build" es una función sin argumentos que devuelve la
+        figura (plotly.graph_objects.Figure).
+        """
+        self._builders[graph_id] = build
+        self._figuras = None
+
+    def build(self):
+        """ Construye y serializa (una única vez) todas las figuras estáticas. Devuelve {graph_id: figura (dict)}. """
+        if self._figuras is None:
+            self._figuras = {graph_id: json.loads(build().to_json()) for graph_id, build in self._builders.items()}
+
+        return self._figuras
+
+    def embed(self, componente_json):
+        """
+        Inserta las figuras estáticas en los dcc.Graph de un componente serializado (ver "utils.serializar_componente").
+        El componente se modifica y se devuelve.
+        """
+        figuras = self.build()
+
+        if isinstance(componente_json, list):
+            for hijo in componente_json:
+                self.embed(hijo)
+        elif isinstance(componente_json, dict) and 'props' in componente_json:
+            props = componente_json['props']
+            if componente_json.get('type') == 'Graph' and props.get('id') in figuras:
+                props['figure'] = figuras[props['id']]
+            self.embed(props.get('children'))
+
+        return componente_json
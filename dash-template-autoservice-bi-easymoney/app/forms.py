@@ -11,7 +11,7 @@ from dash.dependencies import Input, Output, State
 
 # Paquetes
 from app.styles import get_styles
-from EasyMoney import analisis as anl
+from EasyMoney.bundle import get_bundle
 
 # 1. Obtener estilos
 sidebar_style, content_style, text_style, card_text_style = get_styles()
@@ -24,7 +24,6 @@ def get_sidebar():
     ------
         sidebar [{dash.html.Div.Div}] -- HTML del sidebar
     """
-    print('Creating sidebar...')
 
     # 1. Crear controles
     controls = get_sidebar_controls()
@@ -50,7 +49,6 @@ def get_sidebar_controls():
     ------
         form [{dash_bootstrap_components._components.FormGroup.FormGroup}] -- Sidebar de la aplicación web.
     """
-    print('Creating sidebar controls...')
 
     # 1.Crear componentes
     # 1.1. Titulo
@@ -59,7 +57,7 @@ def get_sidebar_controls():
             })
 
     # 1.2. DropDown
-    lista_productos = anl.get_lista_productos(filename='data/lista_productos.csv')
+    lista_productos = get_bundle()['lista_productos']
     dropdown_options = []
     for i, producto in enumerate(lista_productos):
         opt = {
@@ -186,15 +184,18 @@ def get_sidebar_controls():
 
     return controls
 
-def get_client_content():
+def get_client_content(title='Easy Money Autoservice BI'):
     """
     Crear contenido de la página web. El contenido está dividido en tres filas.
 
+    Args:
+    -----
+        title [{str}] -- Título de la sección.
+
     Return:
     -------
         content [{dash.html.Div.Div}] -- Código html de la página web.
     """
-    print('Creating content...')
 
     # Obtener contenido de las filas.
     content_first_row = get_content_first_row()
@@ -204,7 +205,7 @@ def get_client_content():
 
     content = html.Div(
         [
-            html.H2(children='Easy Money Autoservice BI',
+            html.H2(children=title,
                     style=text_style,
                     id='web_title'),
             html.Hr(),
@@ -226,7 +227,6 @@ def get_content_first_row():
     -------
         content_first_row [{dash_bootstrap_components._components.Row.Row}] --- Contenido de la primera fila
     """
-    print('Creating content first row...')
 
     # 1. First row. First column
     card_first_col = dbc.Card(
@@ -315,7 +315,6 @@ def get_content_second_row():
     -------
         content_segunda_row [{dash_bootstrap_components._components.Row.Row}] --- Contenido de la segunda fila
     """
-    print('Creating content second row...')
     content_second_row = dbc.Row(
         [
             dbc.Col(
@@ -336,7 +335,6 @@ def get_content_third_row():
     -------
         content_third_row [{dash_bootstrap_components._components.Row.Row}] --- Contenido de la tercera fila
     """
-    print('Creating content third row...')
 
     content_third_row = dbc.Row(
         [
@@ -356,7 +354,6 @@ def get_content_fourth_row():
     -------
         content_fourth_row [{dash_bootstrap_components._components.Row.Row}] --- Contenido de la cuarta fila
     """
-    print('Creating content third row...')
 
     content_fourth_row = dbc.Row(
         [
@@ -13,7 +13,6 @@ def get_styles():
         card_text_style [{}] --
 
     """
-    print('Setting styles...')
     # 1. Argumentos de estilo para la barra lateral.
     sidebar_style = {
         'position': 'fixed',
@@ -1,5 +1,5 @@
-
-
+# Librerías
+import json
 
 def decode_dropdown_selection(lista_productos, dropdown_value):
     # Tonar valores del dropdown
@@ -13,4 +13,20 @@ def decode_dropdown_selection(lista_productos, dropdown_value):
 
     productos_seleccionados = [dropdown_value_selection[v] for v in dropdown_value]
 
-    return productos_seleccionados
\ No newline at end of file
+    return productos_seleccionados
+
+def serializar_componente(componente):
+    """
+    Serializa un componente de Dash (y todos sus hijos) a su representación JSON (dict). Un callback puede devolver
+    directamente el dict, sin recorrer de nuevo el árbol de componentes en cada petición.
+
+    Args:
+    -----
+        componente [{dash.development.base_component.Component}] -- Componente de Dash.
+
+    Returns:
+    -------
+        componente_json [{dict}] -- Componente serializado.
+    """
+    from plotly.utils import PlotlyJSONEncoder  # Importación diferida (plotly solo se carga al serializar).
+    return json.loads(json.dumps(componente, cls=PlotlyJSONEncoder))
@@ -8,116 +8,62 @@ El diseño consiste en:
  - Barra lateral de control.
  - Página de contenido principal.
 """
-print(5*'-' + 'Easy Money - Autoservicio BI ' + 5 * '-')
+# Informe de tiempos de arranque (STARTUP_MODE=lazy difiere las importaciones pesadas y el layout hasta su primer uso)
+from startup import fase, print_informe, STARTUP_MODE
 
 # Librerías
-print('Importing libs...')
-import dash
-import dash_bootstrap_components as dbc
-from dash import dcc
-from dash import html
-from dash.dependencies import Input, Output, State
-import plotly.express as px
+with fase('imports'):
+    import os
+    from functools import lru_cache
+    from dash.dependencies import Input, Output, State
 
-# Paquetes
-print('Importing pkgs...')
-from app import easymoney_app, get_data, sidebar, client_content, product_content, segmentacion_content, ai_content
-from EasyMoney import visualization as vs
-from EasyMoney import analisis as anl
-from app import utils as utl
-
-# 1. Importar datos
-df_bar, clientes_activos, df_cpi_clientes, df_cpi_productos, df_cpi_ratios, lista_productos = get_data()
-
-# 2. Definición de los callbacks
-print('Defining callbacks...')
-
-# Callback figura 1.
-@easymoney_app.callback(
-    Output('graph_1', 'figure'),
-    [Input('submit_button', 'n_clicks')],
-    [State('dropdown', 'value')])
-def update_graph_1(n_clicks, dropdown_value):
-    nuevos_clientes_productos = df_cpi_clientes[['nuevos_clientes']].join(df_cpi_productos['nuevos_productos'])
-    productos_seleccionados = utl.decode_dropdown_selection(lista_productos, dropdown_value)
-    clientes_productos_contratados = df_cpi_clientes[['numero_clientes']].join(df_cpi_productos['productos_contratados'])
+# 1. Importar datos (compartidos en solo lectura por todos los callbacks: no se copian ni se modifican)
+with fase('data'):
+    from EasyMoney.bundle import get_bundle
+    bundle = get_bundle()
 
-    fig = vs.bar_nuevos_clientes_productos(nuevos_clientes_productos,
-                                           clientes_productos_contratados,
-                                           clientes_activos,
-                                           productos_seleccionados,
-                                           show_fig=False)
-    return fig
+    lista_productos = bundle['lista_productos']
 
+    # Contribución de cada producto a las métricas de una selección (figuras 1, 3 y 4).
+    contribucion = bundle['contribucion']
 
-# Callback figura 3.
-@easymoney_app.callback(
-    Output('graph_3', 'figure'),
-    [Input('submit_button', 'n_clicks')],
-    [State('dropdown', 'value')])
-def update_graph_3(n_clicks, dropdown_value):
-    productos_seleccionados = utl.decode_dropdown_selection(lista_productos, dropdown_value)
-    clientes_productos_contratados = df_cpi_clientes[['numero_clientes']].join(df_cpi_productos['productos_contratados'])
-    nuevos_clientes_productos = df_cpi_clientes[['nuevos_clientes']].join(df_cpi_productos['nuevos_productos'])
-
-    fig = vs.bar_clientes_productos_ratio(df_cpi_ratios.iloc[1:].copy(),
-                                          nuevos_clientes_productos.copy(),
-                                          clientes_productos_contratados.copy(),
-                                          clientes_activos.copy(),
-                                          productos_seleccionados.copy(),
-                                          show_fig=False)
-    return fig
-
-
-# Callback figura 4.
-@easymoney_app.callback(
-    Output('graph_4', 'figure'),
-    [Input('submit_button', 'n_clicks')],
-    [State('dropdown', 'value'), State('range_slider', 'value'), State('check_list', 'value'),
-     State('radio_items', 'value')
-     ])
-def update_graph_4(n_clicks, dropdown_value, range_slider_value, check_list_value, radio_items_value):
-    clientes_productos_contratados = df_cpi_clientes[['numero_clientes']].join(df_cpi_productos['productos_contratados'])
-
-    productos_seleccionados = utl.decode_dropdown_selection(lista_productos, dropdown_value)
+# Paquetes
+with fase('app'):
+    from app import easymoney_app, get_layout, get_section_content, secciones
+    from app import utils as utl
+    from app.cache import FigureCache, version_codigo
+    from EasyMoney.seleccion import mascara_productos, metricas_seleccion
+
+    # Caché de figuras dependientes de la selección de productos (compartida por las figuras 1, 3 y 4). Las figuras
+    # en disco se invalidan si cambian los datos o el código que las construye.
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    figure_cache = FigureCache(
+        version=bundle['version'],
+        version_codigo=version_codigo(*[os.path.join(app_dir, fichero) for fichero in
+                                        ['app1.py', 'EasyMoney/visualization.py', 'EasyMoney/seleccion.py']]))
+
+@easymoney_app.server.route('/figure-cache-stats')
+def figure_cache_stats():
+    return figure_cache.stats()
 
+# 2. Definición de los callbacks
 
-    fig = vs.scatter_clientes_productos(clientes_productos_contratados,
-                                        clientes_activos,
-                                        productos_seleccionados,
-                                        show_fig=False)
-    return fig
+@lru_cache(maxsize=32)
+def get_metricas(mascara):
+    """ Métricas de una selección de productos (compartidas por las figuras 1, 3 y 4 de la misma petición). """
+    return metricas_seleccion(contribucion, mascara)
 
+@lru_cache(maxsize=None)
+def get_iris():
+    """ Datos de ejemplo de la figura 5 (se leen una única vez) """
+    import plotly.express as px
+    return px.data.iris()
 
-# Callback figura 5.
-@easymoney_app.callback(
-    Output('graph_5', 'figure'),
-    [Input('submit_button', 'n_clicks')],
-    [State('dropdown', 'value'), State('range_slider', 'value'), State('check_list', 'value'),
-     State('radio_items', 'value')
-     ])
-def update_graph_5(n_clicks, dropdown_value, range_slider_value, check_list_value, radio_items_value):
-    print(n_clicks)
-    print(dropdown_value)
-    print(range_slider_value)
-    print(check_list_value)
-    print(radio_items_value)  # Sample data and figure
-    df = px.data.iris()
-    fig = px.scatter(df, x='sepal_width', y='sepal_length')
+def update_graph_5(dropdown_value, range_slider_value, check_list_value, radio_items_value):
+    import plotly.express as px  # Importación diferida (solo se carga en la primera petición).
+    fig = px.scatter(get_iris(), x='sepal_width', y='sepal_length')
     return fig
 
-
-# Callback figura 6.
-@easymoney_app.callback(
-    Output('graph_6', 'figure'),
-    [Input('submit_button', 'n_clicks')]
-)
-def update_graph_6(n_clicks):
-    print(n_clicks)
-
-    fig_bar_np = vs.bar_nivel_permanencia(df_bar=df_bar, plot=False)
-    return fig_bar_np
-
 """
 # Callback card title 1.
 @easymoney_app.callback(
@@ -134,32 +80,57 @@ def update_card_title_1(n_clicks, dropdown_value, range_slider_value, check_list
 
 """
 
-## 4. Establecer layout de la web
-#easymoney_app.layout = html.Div([sidebar, client_content])
+# Callback de navegación entre secciones (contenido precalculado, el layout de la aplicación no se modifica).
+@easymoney_app.callback(
+    Output('page_content', 'children'),
+    [Input('radio_items', 'value')],
+    prevent_initial_call=True)
+def update_page_content(radio_items_value):
+    return get_section_content(radio_items_value)
 
-# Callback card text 1.
+# Callback del panel de clientes: una única petición por click devuelve todas las figuras dinámicas.
 @easymoney_app.callback(
-    Output('web_title', 'children'),
+    [Output('graph_1', 'figure'), Output('graph_3', 'figure'), Output('graph_4', 'figure'),
+     Output('graph_5', 'figure')],
     [Input('submit_button', 'n_clicks')],
-    [State('radio_items', 'value')]
-)
-def update_card_text_1(n_clicks, radio_items_value):
-    # 1. Obtener título personalizado por sección
-    base_title = 'Easy Money Autoservice BI'
-    radioitems_options = {
-        'radioitems_value1': 'Clientes',
-        'radioitems_value2': 'Productos',
-        'radioitems_value3': 'Segmentación',
-        'radioitems_value4': 'Aprendizaje Automático',
-
-    }
-    label = base_title + ' - ' +radioitems_options[radio_items_value]
-
-    # 2. Establecer layout correspondiente a la sección
-    if radioitems_options[radio_items_value] == 'Clientes':
-        easymoney_app.layout = html.Div([sidebar, client_content])
-
-    return label
+    [State('dropdown', 'value'), State('range_slider', 'value'), State('check_list', 'value'),
+     State('radio_items', 'value')
+     ])
+def update_client_dashboard(n_clicks, dropdown_value, range_slider_value, check_list_value, radio_items_value):
+    from EasyMoney import visualization as vs  # Importación diferida (plotly solo se carga en la primera petición).
+    productos_seleccionados = utl.decode_dropdown_selection(lista_productos, dropdown_value)
+    mascara = mascara_productos(lista_productos, productos_seleccionados)
+
+    # Figuras 1, 3 y 4. Las métricas de la selección solo se calculan (una vez) si alguna figura no está en la caché.
+    fig_1 = figure_cache.get_or_build(
+        'graph_1', productos_seleccionados,
+        lambda: vs.bar_nuevos_clientes_productos(get_metricas(mascara), show_fig=False))
+    fig_3 = figure_cache.get_or_build(
+        'graph_3', productos_seleccionados,
+        lambda: vs.bar_clientes_productos_ratio(get_metricas(mascara).iloc[1:], show_fig=False))
+    fig_4 = figure_cache.get_or_build(
+        'graph_4', productos_seleccionados,
+        lambda: vs.scatter_clientes_productos(get_metricas(mascara), show_fig=False))
+
+    # Figura 5.
+    fig_5 = update_graph_5(dropdown_value, range_slider_value, check_list_value, radio_items_value)
+
+    # La figura 6 es estática (ver app.static_figures): se incluye en el layout y no tiene callback.
+
+    return fig_1, fig_3, fig_4, fig_5
+
+# 3. Arranque completo (STARTUP_MODE=eager): importaciones diferidas, layout y secciones construidos al arrancar.
+if STARTUP_MODE == 'eager':
+    with fase('layout'):
+        get_layout()
+        for radio_items_value in secciones:
+            get_section_content(radio_items_value)
+    with fase('figures'):
+        import plotly.express
+        from EasyMoney import visualization
+        get_iris()
+
+print_informe()
 
 if __name__ == '__main__':
     easymoney_app.run_server(port=8085, debug=True)
@@ -0,0 +1,20 @@
+"""
+Configuración de gunicorn para el panel de Autoservicio BI (gunicorn la lee automáticamente desde este directorio):
+    gunicorn wsgi:server
+"""
+# Librerías
+import os
+import multiprocessing
+
+bind = os.environ.get('BIND', '0.0.0.0:' + os.environ.get('PORT', '8085'))
+
+# Workers (procesos) e hilos por worker
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.environ.get('WEB_THREADS', 2))
+
+# Precarga de la aplicación en el master: los datos se leen una única vez y los workers los comparten copy-on-write.
+preload_app = True
+
+# Sin recarga automática en producción
+reload = False
+timeout = 60
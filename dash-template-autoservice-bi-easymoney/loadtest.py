@@ -0,0 +1,118 @@
+"""
+Prueba de carga local del panel de Autoservicio BI.
+
+Simula varios clientes concurrentes que pulsan "Submit" con selecciones de productos aleatorias y mide la latencia de
+cada callback (una petición a /_dash-update-component por callback disparado por el botón). Al final muestra el
+número de peticiones y las latencias p50 / p95 por callback.
+
+Uso (con el panel en ejecución, p.ej. "gunicorn wsgi:server"):
+    python loadtest.py --url http://localhost:8085 --clientes 16 --clicks 50
+"""
+# Librerías
+import argparse
+import json
+import random
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+def get_json(url, body=None):
+    """ Petición GET (o POST si hay body) con respuesta JSON """
+    data = None if body is None else json.dumps(body).encode('utf-8')
+    request = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+def get_callbacks_submit(url):
+    """ Callbacks disparados por el botón "Submit" (ver /_dash-dependencies) """
+    dependencias = get_json(url + '/_dash-dependencies')
+    return [d for d in dependencias if any(i['id'] == 'submit_button' for i in d['inputs'])]
+
+def get_dropdown_values(url):
+    """ Valores del dropdown de productos (ver /_dash-layout) """
+    valores = []
+    pendientes = [get_json(url + '/_dash-layout')]
+    while pendientes:
+        componente = pendientes.pop()
+        if isinstance(componente, list):
+            pendientes.extend(componente)
+        elif isinstance(componente, dict) and 'props' in componente:
+            if componente['props'].get('id') == 'dropdown':
+                valores = [opcion['value'] for opcion in componente['props']['options']]
+            pendientes.append(componente['props'].get('children'))
+
+    return valores
+
+def get_body(callback, valores):
+    """ Cuerpo de la petición de un callback a partir de los valores de los controles """
+    salidas = callback['output']
+    multiple = salidas.startswith('..')
+    outputs = [dict(zip(['id', 'property'], s.split('.'))) for s in salidas.strip('.').split('...')]
+
+    def get_valor(d):
+        return {'id': d['id'], 'property': d['property'], 'value': valores.get(f"{d['id']}.{d['property']}")}
+
+    return {
+        'output': salidas,
+        'outputs': outputs if multiple else outputs[0],
+        'inputs': [get_valor(i) for i in callback['inputs']],
+        'state': [get_valor(s) for s in callback['state']],
+        'changedPropIds': ['submit_button.n_clicks'],
+    }
+
+def simular_cliente(url, callbacks, dropdown_values, clicks, semilla):
+    """
+    Cliente simulado: "clicks" pulsaciones de "Submit" con una selección de productos aleatoria.
+
+    Returns:
+        latencias [{list}] -- (callback, segundos) de cada petición.
+    """
+    rng = random.Random(semilla)
+    latencias = []
+    for n_clicks in range(1, clicks + 1):
+        seleccion = [v for v in dropdown_values if rng.random() < 0.5] or dropdown_values[:1]
+        valores = {
+            'dropdown.value': seleccion,
+            'range_slider.value': [5, 15],
+            'check_list.value': ['value1'],
+            'radio_items.value': 'radioitems_value1',
+            'submit_button.n_clicks': n_clicks,
+        }
+        for callback in callbacks:
+            inicio = time.perf_counter()
+            get_json(url + '/_dash-update-component', get_body(callback, valores))
+            latencias.append((callback['output'], time.perf_counter() - inicio))
+
+    return latencias
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:8085', help='URL del panel')
+    parser.add_argument('--clientes', type=int, default=16, help='Número de clientes concurrentes')
+    parser.add_argument('--clicks', type=int, default=50, help='Pulsaciones de "Submit" por cliente')
+    parser.add_argument('--semilla', type=int, default=0, help='Semilla de las selecciones aleatorias')
+    args = parser.parse_args()
+
+    url = args.url.rstrip('/')
+    callbacks = get_callbacks_submit(url)
+    dropdown_values = get_dropdown_values(url)
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clientes) as executor:
+        resultados = executor.map(
+            lambda i: simular_cliente(url, callbacks, dropdown_values, args.clicks, args.semilla + i),
+            range(args.clientes))
+        latencias = [latencia for resultado in resultados for latencia in resultado]
+    duracion = time.perf_counter() - inicio
+
+    num_clicks = args.clientes * args.clicks
+    print(f'Clientes: {args.clientes} | Clicks: {num_clicks} | Peticiones: {len(latencias)} '
+          f'({len(latencias) / num_clicks:.1f} por click) | Duración: {duracion:.1f} s | '
+          f'{num_clicks / duracion:.1f} clicks/s')
+
+    for callback in callbacks:
+        segundos = np.array([s for salida, s in latencias if salida == callback['output']]) * 1000
+        p50, p95 = np.percentile(segundos, [50, 95])
+        print(f"\t{callback['output']}: p50 {p50:.1f} ms | p95 {p95:.1f} ms")
@@ -0,0 +1,58 @@
+"""
+Informe de tiempos de arranque del panel.
+
+Cada fase del arranque (importaciones, lectura de datos, construcción del layout, ...) se mide con "fase" y al final
+se emite un informe estructurado (una línea JSON) con la duración de cada fase, el total y el presupuesto de arranque
+(variable de entorno STARTUP_BUDGET, en segundos). Este módulo no importa ninguna librería pesada, de forma que puede
+importarse en primer lugar.
+"""
+# Librerías
+import os
+import json
+import time
+from contextlib import contextmanager
+
+# Modo de arranque: "lazy" (importaciones pesadas y layout bajo demanda) o "eager" (todo al arrancar)
+STARTUP_MODE = os.environ.get('STARTUP_MODE', 'lazy')
+
+# Presupuesto de arranque en segundos (None si no se ha definido)
+STARTUP_BUDGET = float(os.environ['STARTUP_BUDGET']) if os.environ.get('STARTUP_BUDGET') else None
+
+_inicio = time.perf_counter()
+_fases = []
+
+@contextmanager
+def fase(nombre):
+    """
+    Mide la duración de una fase del arranque.
+
+    Args:
+        nombre [{str}] -- Nombre de la fase.
+    """
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        _fases.append({'fase': nombre, 'segundos': round(time.perf_counter() - inicio, 4)})
+
+def get_informe():
+    """
+    Informe de tiempos de arranque.
+
+    Returns:
+        informe [{dict}] -- Modo de arranque, fases (nombre y duración), total desde la importación de este módulo,
+                            presupuesto y si el arranque se encuentra dentro del presupuesto.
+    """
+    total = round(time.perf_counter() - _inicio, 4)
+
+    return {
+        'modo': STARTUP_MODE,
+        'fases': list(_fases),
+        'total': total,
+        'presupuesto': STARTUP_BUDGET,
+        'dentro_presupuesto': None if STARTUP_BUDGET is None else total <= STARTUP_BUDGET,
+    }
+
+def print_informe():
+    """ Emite el informe de tiempos de arranque en una única línea JSON. """
+    print(json.dumps({'startup': get_informe()}, ensure_ascii=False))
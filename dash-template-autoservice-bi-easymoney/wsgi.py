@@ -0,0 +1,26 @@
+"""
+Entrada de producción (WSGI) del panel de Autoservicio BI.
+
+Expone el servidor Flask del panel ("server") para un servidor WSGI con varios workers, p.ej. (ver gunicorn.conf.py):
+    gunicorn wsgi:server
+
+Con la precarga de gunicorn (preload_app) este módulo se importa una única vez en el proceso master: el paquete de
+datos, la contribución de los productos, el layout y las figuras estáticas se cargan antes de crear los workers, que
+los comparten copy-on-write. El modo debug y la recarga automática (exclusivos de run_server) no se activan.
+"""
+# Librerías
+import os
+import gc
+
+# Arranque completo: todo lo que se construye bajo demanda se construye en el master (ver startup.py)
+os.environ.setdefault('STARTUP_MODE', 'eager')
+
+# Paquetes
+from app1 import easymoney_app
+
+server = easymoney_app.server
+server.config['DEBUG'] = False
+
+# Los objetos creados durante la precarga no los recorre el recolector de basura de los workers, de forma que sus
+# páginas de memoria no se copian (copy-on-write) al hacer fork.
+gc.freeze()
@@ -1,160 +1,788 @@
 # Librerías
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
-from tqdm import tqdm
 
-def get_commercial_activity_df(filename_dir):
+# Paquetes
+from .cache import cargar_con_cache, cargar_json_con_cache
+
+# Listado de productos del dataset products_df.csv
+LISTA_PRODUCTOS = [
+    'short_term_deposit', 'loans', 'mortgage', 'funds', 'securities',
+    'long_term_deposit', 'em_account_pp', 'credit_card', 'payroll',
+    'pension_plan', 'payroll_account', 'emc_account', 'debit_card',
+    'em_account_p', 'em_account'
+]
+
+# Columnas clave de los datasets (no son productos ni atributos del cliente)
+COLUMNAS_CLAVE = ['pk_cid', 'pk_partition', 'indice_mes']
+
+def calcular_indice_mes(fechas):
     """
-    Carga el fichero commercial_activity_df.csv y se encarga de aplicar el formato
-    adecuado a las columnas que lo componen.
+    Índice de mes de una columna de fechas: número de meses desde enero de 1970 (int16, -1 para los nulos). Es el
+    índice de mes común a todas las funciones del módulo (columna "indice_mes" de los loaders, pk_partition del
+    esquema compacto y claves cliente-mes de la tabla de hechos).
 
     Args:
     -----
-    filename_dir [{str}] -- Directorio de almacenamiento incluyendo el nombre
-                            fichero.
+    fechas [{pandas.Series}] -- Columna de fechas en formato datetime.
 
     Returns:
     ------
-    df_comm [{pandas.DataFrame}] -- Fichero csv cargado en formato DataFrame
+    indice_mes [{numpy.ndarray}] -- Índice int16 del mes de cada fecha.
     """
+    codigos, unicos = pd.factorize(fechas)
+    unicos = pd.DatetimeIndex(unicos)
+    unicos_mes = np.where(unicos.isna(), -1, (unicos.year - 1970) * 12 + unicos.month - 1)
 
-    df_comm = pd.read_csv(filename_dir, sep=',', encoding='utf-8-sig')
-    df_comm.drop('Unnamed: 0', axis=1, inplace=True)
-    df_comm['pk_cid'] = df_comm.pk_cid.apply(str)
-    df_comm['pk_partition'] = pd.to_datetime(df_comm.pk_partition, format='%Y-%m-%d')
+    # El código -1 de los nulos apunta al valor -1 añadido al final
+    return np.append(unicos_mes, -1).astype(np.int16)[codigos]
 
-    # Cambiar fecha 29 febrero da problemas al 28 febrrero
-    df_comm.loc[df_comm['entry_date'] == '2015-02-29', 'entry_date'] = '2015-02-28'
-    df_comm.loc[df_comm['entry_date'] == '2019-02-29', 'entry_date'] = '2019-02-28'
-    df_comm['entry_date'] = pd.to_datetime(df_comm.entry_date, format='%Y-%m-%d')
+def reparar_fechas(fechas):
+    """
+    Repara fechas con formato año-mes-día cuyo día no existe en el mes (p.ej. '2015-02-29' o '2019-04-31')
+    estableciendo el último día del mes correspondiente.
 
-    return df_comm
+    Args:
+    -----
+    fechas [{pandas.Index}] -- Fechas en texto (formato '%Y-%m-%d').
 
-def resume_commercial_activity_df(df_comm):
+    Returns:
+    ------
+    fechas_reparadas [{pandas.DatetimeIndex}] -- Fechas reparadas.
+
+    Raises:
+    ------
+    ValueError -- Si alguna fecha no tiene formato año-mes-día con mes entre 1 y 12 y día entre 1 y 31.
     """
-    Imprime por pantalla un resumen sobre las características principales del dataset "commercial_activity_df.csv"
+    partes = pd.Series(fechas, dtype=object).str.extract(r'^(\d{4})-(\d{1,2})-(\d{1,2})$').astype(np.float64)
+    anio, mes, dia = partes[0], partes[1], partes[2]
+
+    validas = (mes.between(1, 12) & dia.between(1, 31)).to_numpy()
+    if not validas.all():
+        raise ValueError(f'Fechas con formato no válido: {list(pd.Index(fechas)[~validas])}')
+
+    inicio_mes = pd.to_datetime(pd.DataFrame({'year': anio, 'month': mes, 'day': 1}))
+    dia = np.minimum(dia, inicio_mes.dt.days_in_month)
+
+    return pd.DatetimeIndex(inicio_mes + pd.to_timedelta(dia - 1, unit='D'))
+
+def parsear_fechas(fechas, format='%Y-%m-%d'):
+    """
+    Convierte una columna de fechas en texto a datetime analizando únicamente sus valores únicos (los datasets tienen
+    millones de filas, pero solo unas decenas de fechas de ingesta distintas). Las fechas con un día que no existe en
+    el mes se reparan con "reparar_fechas"; cualquier otro valor no válido produce un error.
 
     Args:
-    df_comm [{pandas.DataFrame}] -- DataFrame obtenido con la función "commercial_activity_df"
     -----
+    fechas [{pandas.Series}] -- Columna de fechas en texto.
+    format [{str}] -- Formato de las fechas.
+
+    Returns:
+    ------
+    fechas_dt [{pandas.Series}] -- Columna de fechas en formato datetime (NaT para los nulos).
+    indice_mes [{numpy.ndarray}] -- Índice int16 del mes de cada fecha (ver "calcular_indice_mes").
     """
+    codigos, unicos = pd.factorize(fechas)
 
-    # Mostrar características principales del dataset
-    print('Tamaño del dataset')
-    print(f'\tSamples: {df_comm.shape[0]}')
-    print(f'\tFeatures: {df_comm.shape[1]}')
-    print(2 * '\n')
+    # Analizar únicamente los valores únicos y reparar los que no son fechas del calendario
+    unicos_dt = pd.to_datetime(unicos, format=format, errors='coerce').to_numpy()
+    invalidos = np.isnat(unicos_dt)
+    if invalidos.any():
+        unicos_dt[invalidos] = reparar_fechas(unicos[invalidos]).to_numpy()
+    unicos_mes = calcular_indice_mes(unicos_dt)
 
-    # Número total de particiones en el dataframe
-    n_particiones = df_comm.pk_partition.value_counts().shape[0]
-    print(f'Número de particiones del histórico: {n_particiones}')
+    # Traducir los códigos (el código -1 de los nulos apunta al valor nulo añadido al final)
+    fechas_dt = np.append(unicos_dt, np.datetime64('NaT', 'ns'))[codigos]
+    indice_mes = np.append(unicos_mes, np.int16(-1))[codigos]
 
-    # Número total de fechas de eentrada
-    n_entry_date = df_comm.entry_date.value_counts().shape[0]
-    print(f'Número de fechas de entrada de los clientes: {n_entry_date}')
+    return pd.Series(fechas_dt, index=fechas.index, name=fechas.name), indice_mes
 
+def crear_diccionario_clientes(*pk_cids):
+    """
+    Crea el diccionario de clientes compartido por los datasets de productos, actividad comercial y datos
+    sociodemográficos: cada pk_cid recibe un código int32 denso (su posición en el diccionario).
 
-    # Número de clientes únicos
-    clients_id = list(df_comm.pk_cid.unique())
-    print(f'Número de clientes únicos: {len(clients_id)}')
-    print(2 * '\n')
+    Args:
+    -----
+    pk_cids [{pandas.Series}] -- Columnas pk_cid de los datasets (enteros, texto o categóricas). De las columnas
+                                  categóricas (p.ej. leídas de la caché columnar) solo se usan sus categorías.
 
-    # Información del dataframe
-    print('Información del DataFrame')
-    print(df_comm.info())
-    print(2 * '\n')
+    Returns:
+    ------
+    clientes [{pandas.Index}] -- pk_cid (texto, ordenados) de cada código de cliente (clientes[codigo]).
+    """
+    unicos = [np.asarray(pk_cid.cat.categories if isinstance(pk_cid.dtype, pd.CategoricalDtype)
+                         else pd.unique(pk_cid)).astype(str) for pk_cid in pk_cids]
+    clientes = np.unique(np.concatenate(unicos)) if unicos else np.array([], dtype=str)
 
-    # Descripción del dataframe
-    print('Descripción del dataset')
-    print(df_comm.describe())
-    print(2 * '\n')
+    return pd.Index(clientes.astype(object), name='pk_cid')
 
-    # Valores nulos
-    print('Valores nulos', df_comm.isna().sum(), sep=2 * '\n')
-    print(2 * '\n')
+def get_diccionario_clientes(*filenames_dir):
+    """
+    Crea el diccionario de clientes (ver "crear_diccionario_clientes") leyendo únicamente la columna pk_cid de los
+    ficheros csv.
 
-    # Conteo de valores
-    print('Active Consumer')
-    print(df_comm['active_customer'].value_counts(normalize=True))
-    print(2 * '\n')
+    Args:
+    -----
+    filenames_dir [{str}] -- Directorios de almacenamiento de los ficheros csv.
+
+    Returns:
+    ------
+    clientes [{pandas.Index}] -- Diccionario de clientes.
+    """
+    pk_cids = [pd.read_csv(filename_dir, sep=',', encoding='utf-8-sig', usecols=['pk_cid'])['pk_cid']
+               for filename_dir in filenames_dir]
+
+    return crear_diccionario_clientes(*pk_cids)
+
+def codificar_clientes(pk_cid, clientes):
+    """
+    Codifica la columna pk_cid con el diccionario de clientes. Solo se traducen los valores únicos de la columna
+    (el resto de la conversión es una indexación de enteros).
+
+    Args:
+    -----
+    pk_cid [{pandas.Series}] -- Identificador de cliente (entero, texto o categórico).
+    clientes [{pandas.Index}] -- Diccionario de clientes (ver "crear_diccionario_clientes").
+
+    Returns:
+    ------
+    codigos [{numpy.ndarray}] -- Código int32 de cada cliente.
+    """
+    codigos, unicos = pd.factorize(pk_cid)
+    codigos_unicos = clientes.get_indexer(np.asarray(unicos).astype(str))
+
+    if (codigos_unicos == -1).any():
+        raise ValueError('Existen clientes (pk_cid) que no se encuentran en el diccionario de clientes.')
+
+    return codigos_unicos.astype(np.int32)[codigos]
+
+def decodificar_clientes(codigos, clientes):
+    """
+    Traducción inversa de los códigos de cliente al pk_cid original (para su visualización).
+
+    Args:
+    -----
+    codigos [{numpy.ndarray}] -- Códigos de cliente (ver "codificar_clientes").
+    clientes [{pandas.Index}] -- Diccionario de clientes.
+
+    Returns:
+    ------
+    pk_cid [{numpy.ndarray}] -- pk_cid de cada código.
+    """
+    return clientes.to_numpy()[np.asarray(codigos)]
+
+def formato_pk_cid(df, clientes=None):
+    """
+    Formato de la columna pk_cid: texto o, si se indica el diccionario de clientes, código int32.
+    """
+    if clientes is None:
+        df['pk_cid'] = df['pk_cid'].apply(str)
+    else:
+        df['pk_cid'] = codificar_clientes(df['pk_cid'], clientes)
+
+    return df
+
+def incluir_indice_mes(df, meses=None):
+    """
+    Añade a un dataset la columna "indice_mes" a continuación de pk_partition.
+
+    Args:
+    -----
+    df [{pandas.DataFrame}] -- Dataset con pk_partition en formato datetime.
+    meses [{numpy.ndarray}] -- Índice de mes ya calculado (ver "parsear_fechas"). Si es None, se calcula.
+
+    Returns:
+    ------
+    df [{pandas.DataFrame}] -- Dataset con la columna "indice_mes".
+    """
+    meses = calcular_indice_mes(df['pk_partition']) if meses is None else meses
+    if 'indice_mes' in df.columns:
+        df['indice_mes'] = meses
+    else:
+        df.insert(df.columns.get_loc('pk_partition') + 1, 'indice_mes', meses)
+
+    return df
+
+def get_datasets_clientes(products_dir, commercial_activity_dir, sociodemographic_dir, cache_dir=None,
+                          usar_hash=False, indice_mes=False):
+    """
+    Carga los datasets de productos, actividad comercial y datos sociodemográficos con un diccionario de clientes
+    compartido: pk_cid es un código int32 común a los tres datasets, de forma que los merge y groupby entre ellos
+    son operaciones sobre enteros.
+
+    Args:
+    -----
+    products_dir [{str}] -- Directorio del fichero products_df.csv.
+    commercial_activity_dir [{str}] -- Directorio del fichero commercial_activity_df.csv.
+    sociodemographic_dir [{str}] -- Directorio del fichero sociodemographic_df.csv.
+    cache_dir [{str}] -- Directorio de la caché columnar (ver "cache.cargar_con_cache").
+    usar_hash [{bool}] -- Validar la caché también con el hash del contenido del fichero.
+    indice_mes [{bool}] -- Añadir la columna "indice_mes" a los tres datasets (ver "calcular_indice_mes").
+
+    Returns:
+    ------
+    df_prod [{pandas.DataFrame}] -- Dataset de productos.
+    df_comm [{pandas.DataFrame}] -- Dataset de actividad comercial.
+    df_sd [{pandas.DataFrame}] -- Dataset de datos sociodemográficos.
+    clientes [{pandas.Index}] -- Diccionario de clientes (pk_cid de cada código).
+    """
+    if cache_dir is not None:
+        # Con caché, el diccionario se construye con las categorías de pk_cid de los datasets ya cargados (sin volver
+        # a leer los ficheros csv) y después se codifica pk_cid
+        df_prod = get_products_df(products_dir, cache_dir=cache_dir, usar_hash=usar_hash, indice_mes=indice_mes)
+        df_comm = get_commercial_activity_df(commercial_activity_dir, cache_dir=cache_dir, usar_hash=usar_hash,
+                                             indice_mes=indice_mes)
+        df_sd = get_sociodemographic_df(sociodemographic_dir, cache_dir=cache_dir, usar_hash=usar_hash,
+                                        indice_mes=indice_mes)
+
+        clientes = crear_diccionario_clientes(df_prod['pk_cid'], df_comm['pk_cid'], df_sd['pk_cid'])
+        for df in [df_prod, df_comm, df_sd]:
+            formato_pk_cid(df, clientes)
+
+        return df_prod, df_comm, df_sd, clientes
+
+    # Sin caché, pk_cid se codifica durante la carga (leyendo antes únicamente la columna pk_cid de los ficheros)
+    clientes = get_diccionario_clientes(products_dir, commercial_activity_dir, sociodemographic_dir)
+
+    df_prod = get_products_df(products_dir, usar_hash=usar_hash, clientes=clientes, indice_mes=indice_mes)
+    df_comm = get_commercial_activity_df(commercial_activity_dir, usar_hash=usar_hash, clientes=clientes,
+                                         indice_mes=indice_mes)
+    df_sd = get_sociodemographic_df(sociodemographic_dir, usar_hash=usar_hash, clientes=clientes,
+                                    indice_mes=indice_mes)
+
+    return df_prod, df_comm, df_sd, clientes
+
+def claves_cliente_mes(df):
+    """
+    Clave entera (cliente, mes) de cada fila: codigo_cliente * 2^16 + indice_mes (ver "calcular_indice_mes").
+
+    Args:
+    -----
+    df [{pandas.DataFrame}] -- Dataset con pk_cid codificado (ver "codificar_clientes") y pk_partition (o la
+                               columna "indice_mes", si ya se ha calculado).
+
+    Returns:
+    ------
+    claves [{numpy.ndarray}] -- Clave int64 de cada fila.
+    """
+    if not pd.api.types.is_integer_dtype(df['pk_cid']):
+        raise ValueError('pk_cid debe estar codificado como entero (ver "get_datasets_clientes").')
+
+    meses = df['indice_mes'].to_numpy() if 'indice_mes' in df.columns else calcular_indice_mes(df['pk_partition'])
+    if (meses < 0).any():
+        raise ValueError('pk_partition no puede tener valores nulos.')
+
+    return (df['pk_cid'].to_numpy(dtype=np.int64) << 16) + meses
+
+def ordenar_claves(claves, nombre):
+    """
+    Orden de las filas por clave (se omite si las claves ya están ordenadas). Las claves deben ser únicas.
+    """
+    orden = None if (claves[1:] > claves[:-1]).all() else np.argsort(claves, kind='stable')
+    claves_ordenadas = claves if orden is None else claves[orden]
+
+    if (claves_ordenadas[1:] == claves_ordenadas[:-1]).any():
+        raise ValueError(f'El dataset "{nombre}" tiene filas duplicadas para un mismo cliente y mes.')
+
+    return claves_ordenadas, orden
+
+def tabla_hechos_clientes(df_prod, df_comm, df_sd, columnas_prod=None, columnas_comm=None, columnas_sd=None,
+                          how='inner'):
+    """
+    Tabla de hechos cliente-mes: une los datasets de productos, actividad comercial y datos sociodemográficos por
+    (pk_cid, pk_partition) en una única tabla compacta.
+
+    La unión es un merge-join sobre claves enteras (cliente, mes) ordenadas: cada dataset se ordena por clave (si no
+    lo está ya) y las filas coincidentes se localizan por búsqueda binaria. Solo se materializan las columnas
+    solicitadas (proyección), con un único acceso por columna.
+
+    Args:
+    -----
+    df_prod [{pandas.DataFrame}] -- Dataset de productos (pk_cid codificado, ver "get_datasets_clientes").
+    df_comm [{pandas.DataFrame}] -- Dataset de actividad comercial (pk_cid codificado).
+    df_sd [{pandas.DataFrame}] -- Dataset de datos sociodemográficos (pk_cid codificado).
+    columnas_prod [{list}] -- Columnas de productos a incluir (None: todas).
+    columnas_comm [{list}] -- Columnas de actividad comercial a incluir (None: todas).
+    columnas_sd [{list}] -- Columnas sociodemográficas a incluir (None: todas).
+    how [{str}] -- 'inner' (filas presentes en los tres datasets) o 'left' (todas las filas de productos; las
+                   columnas sin coincidencia quedan nulas).
+
+    Returns:
+    ------
+    df_hechos [{pandas.DataFrame}] -- Tabla de hechos ordenada por cliente y mes: pk_cid, pk_partition y las
+                                      columnas solicitadas.
+    """
+    if how not in ('inner', 'left'):
+        raise ValueError('how debe ser "inner" o "left".')
+
+    fuentes = {
+        'productos': (df_prod, columnas_prod),
+        'actividad comercial': (df_comm, columnas_comm),
+        'sociodemográfico': (df_sd, columnas_sd),
+    }
+
+    # Columnas solicitadas de cada dataset (sin las claves)
+    proyeccion = dict()
+    for nombre, (df, columnas) in fuentes.items():
+        columnas = df.columns.drop(COLUMNAS_CLAVE, errors='ignore') if columnas is None else pd.Index(columnas)
+        repetidas = [c for c in columnas if any(c in cols for cols in proyeccion.values())]
+        if repetidas:
+            raise ValueError(f'Columnas repetidas entre datasets: {repetidas}')
+        proyeccion[nombre] = columnas
+
+    # Claves (cliente, mes) ordenadas
+    claves = {nombre: ordenar_claves(claves_cliente_mes(df), nombre) for nombre, (df, _) in fuentes.items()}
+
+    # Merge-join: posición de cada clave de productos en los otros dos datasets (búsqueda binaria)
+    claves_prod, orden_prod = claves['productos']
+    posiciones = dict()
+    for nombre in ['actividad comercial', 'sociodemográfico']:
+        claves_otro, _ = claves[nombre]
+        posicion = np.searchsorted(claves_otro, claves_prod)
+        encontrada = posicion < len(claves_otro)
+        encontrada[encontrada] = claves_otro[posicion[encontrada]] == claves_prod[encontrada]
+        posiciones[nombre] = (posicion, encontrada)
+
+    seleccion = np.arange(len(claves_prod))
+    if how == 'inner':
+        seleccion = np.flatnonzero(np.logical_and.reduce([encontrada for _, encontrada in posiciones.values()]))
+
+    # Filas de cada dataset (en su orden original) que forman la tabla de hechos. Sin coincidencia: -1.
+    filas = {'productos': seleccion if orden_prod is None else orden_prod[seleccion]}
+    for nombre, (posicion, encontrada) in posiciones.items():
+        _, orden = claves[nombre]
+        encontrada = encontrada[seleccion]
+        posicion = posicion[seleccion][encontrada]
+        filas[nombre] = np.full(len(seleccion), -1, dtype=np.int64)
+        filas[nombre][encontrada] = posicion if orden is None else orden[posicion]
+
+    # Proyección: solo se materializan las columnas solicitadas
+    claves_hechos = claves_prod[seleccion]
+    columnas = {
+        'pk_cid': (claves_hechos >> 16).astype(np.int32),
+        'pk_partition': df_prod['pk_partition'].array.take(filas['productos']),
+        'indice_mes': (claves_hechos & 0xFFFF).astype(np.int16),
+    }
+    for nombre, (df, _) in fuentes.items():
+        sin_coincidencia = (filas[nombre] == -1).any()
+        for columna in proyeccion[nombre]:
+            # allow_fill: las filas sin coincidencia (-1, how='left') quedan nulas
+            columnas[columna] = df[columna].array.take(filas[nombre], allow_fill=sin_coincidencia)
+
+    # Sin consolidar las columnas en bloques (evita una copia completa de la tabla)
+    return pd.DataFrame(columnas, copy=False)
+
+# Número máximo de valores distintos por columna cuya frecuencia se conserva en el perfil
+MAX_DISTINTOS_PERFIL = 1000000
+
+def ordenar_frecuencias(conteo):
+    """
+    Ordena las frecuencias de una columna de mayor a menor frecuencia y, a igual frecuencia, por valor: el orden no
+    depende del orden de las filas ni de los bloques en los que se haya leído el dataset.
+    """
+    try:
+        conteo = conteo.sort_index()
+    except TypeError:
+        # Valores de tipos no comparables entre sí: se ordenan por su representación en texto
+        conteo = conteo.sort_index(key=lambda valores: valores.astype(str))
+
+    return conteo.sort_values(ascending=False, kind='stable')
+
+def momentos_frecuencias(valores, pesos):
+    """
+    Número de valores, media, suma de cuadrados de las desviaciones, mínimo y máximo de una columna numérica a partir
+    de sus valores distintos y su frecuencia (None si no hay valores).
+    """
+    n = int(pesos.sum())
+    if n == 0:
+        return None
+
+    valores = valores.astype(np.float64)
+    media = float(np.dot(valores, pesos) / n)
+
+    return n, media, float(np.dot(pesos, (valores - media) ** 2)), float(valores.min()), float(valores.max())
+
+def combinar_momentos(momentos, momentos_bloque):
+    """
+    Combina los momentos de dos bloques (ver "momentos_frecuencias") sin volver a recorrer los datos.
+    """
+    if momentos is None or momentos_bloque is None:
+        return momentos if momentos_bloque is None else momentos_bloque
+
+    n_a, media_a, m2_a, min_a, max_a = momentos
+    n_b, media_b, m2_b, min_b, max_b = momentos_bloque
+    n = n_a + n_b
+    delta = media_b - media_a
+
+    return n, media_a + delta * n_b / n, m2_a + m2_b + delta ** 2 * n_a * n_b / n, min(min_a, min_b), max(max_a, max_b)
+
+def fusionar_frecuencias(columna, max_distintos):
+    """
+    Fusiona las frecuencias pendientes de una columna con las acumuladas. Si la columna supera "max_distintos"
+    valores distintos, solo se conservan los "max_distintos" más frecuentes y la columna pasa a ser aproximada (ver
+    "acumular_frecuencias").
+    """
+    pendientes = [columna['conteo']] + columna.pop('pendientes')
+    conteo = pd.concat(pendientes).groupby(level=0, sort=False).sum() if len(pendientes) > 1 else pendientes[0]
+
+    columna['distintos'] = max(columna['distintos'], len(conteo))
+    if len(conteo) > max_distintos:
+        conteo = ordenar_frecuencias(conteo).iloc[:max_distintos]
+        columna['aproximado'] = True
 
-    print('Segment')
-    print(df_comm['segment'].value_counts(normalize=True))
+    columna['conteo'] = conteo
+    columna['pendientes'] = []
+
+def acumular_frecuencias(frecuencias, df, max_distintos=MAX_DISTINTOS_PERFIL):
+    """
+    Acumula la frecuencia de cada valor de cada columna de un DataFrame (o de un bloque de un fichero). Es el único
+    recorrido de los datos que necesita el perfil: nulos, valores distintos, resumen numérico y valores más
+    frecuentes se obtienen de las frecuencias (ver "perfil_frecuencias").
+
+    La memoria está acotada por "max_distintos" valores por columna. Las frecuencias de los bloques se fusionan cuando
+    las pendientes superan ese número (y no en cada bloque). Si una columna supera "max_distintos" valores distintos
+    (p.ej. pk_cid o salary en un fichero mayor), se marca como aproximada: solo se conservan los valores más
+    frecuentes (sus frecuencias y el número de valores distintos pasan a ser cotas inferiores) y no se calculan sus
+    cuantiles. El número de valores, la media, la desviación típica, el mínimo y el máximo son siempre exactos.
+
+    Args:
+    -----
+    frecuencias [{dict}] -- Frecuencias acumuladas (None si es el primer bloque).
+    df [{pandas.DataFrame}] -- DataFrame o bloque.
+    max_distintos [{int}] -- Número máximo de valores distintos conservados por columna.
+
+    Returns:
+    ------
+    frecuencias [{dict}] -- Número de filas y, por columna: tipo, número de nulos, momentos (columnas numéricas) y
+                            frecuencia de cada valor.
+    """
+    if frecuencias is None:
+        frecuencias = {'filas': 0, 'columnas': dict()}
+
+    frecuencias['filas'] += len(df)
+    for col_name in df.columns:
+        serie = df[col_name]
+        conteo = serie.value_counts(sort=False)
+        conteo = conteo[conteo > 0]  # Categorías sin valores (columnas categóricas)
+        nulos = len(serie) - int(conteo.sum())
+
+        momentos = None
+        if pd.api.types.is_numeric_dtype(serie.dtype) and not pd.api.types.is_bool_dtype(serie.dtype):
+            momentos = momentos_frecuencias(conteo.index.to_numpy(), conteo.to_numpy())
+
+        columna = frecuencias['columnas'].get(col_name)
+        if columna is None:
+            columna = frecuencias['columnas'][col_name] = {
+                'dtype': serie.dtype, 'nulos': 0, 'momentos': None, 'distintos': 0, 'aproximado': False,
+                'conteo': conteo.iloc[:0], 'pendientes': [],
+            }
+        elif columna['dtype'] != serie.dtype:
+            columna['dtype'] = np.result_type(columna['dtype'], serie.dtype)
+
+        columna['nulos'] += nulos
+        columna['momentos'] = combinar_momentos(columna['momentos'], momentos)
+        columna['pendientes'].append(conteo)
+        if sum(len(c) for c in columna['pendientes']) > max_distintos:
+            fusionar_frecuencias(columna, max_distintos)
+
+    return frecuencias
+
+def cuantiles_frecuencias(valores, pesos, cuantiles=(0.25, 0.5, 0.75)):
+    """
+    Cuantiles exactos (interpolación lineal, como "describe") de una columna a partir de sus valores distintos y su
+    frecuencia.
+    """
+    orden = np.argsort(valores, kind='stable')
+    valores = valores[orden].astype(np.float64)
+    acumulado = np.cumsum(pesos[orden].astype(np.int64))
+    n = int(acumulado[-1])
+
+    # Valor en la posición k de la columna ordenada
+    def valor_posicion(k):
+        return valores[np.searchsorted(acumulado, k, side='right')]
+
+    resultado = dict()
+    for q in cuantiles:
+        posicion = (n - 1) * q
+        inferior = int(np.floor(posicion))
+        x_inf, x_sup = valor_posicion(inferior), valor_posicion(min(inferior + 1, n - 1))
+        resultado[f'{q:.0%}'] = float(x_inf + (posicion - inferior) * (x_sup - x_inf))
+
+    return resultado
+
+def perfil_frecuencias(frecuencias, top_k=10, max_distintos=MAX_DISTINTOS_PERFIL):
+    """
+    Perfil de un dataset a partir de sus frecuencias (ver "acumular_frecuencias").
+
+    Args:
+    -----
+    frecuencias [{dict}] -- Frecuencias acumuladas.
+    top_k [{int}] -- Número de valores más frecuentes por columna (a igual frecuencia, ordenados por valor).
+    max_distintos [{int}] -- Número máximo de valores distintos conservados por columna.
+
+    Returns:
+    ------
+    perfil [{dict}] -- Número de filas y columnas y, por columna: tipo, nulos, valores distintos, si el perfil de la
+                       columna es aproximado, resumen numérico (None si la columna no es numérica) y valores más
+                       frecuentes ([valor, frecuencia]). Serializable a JSON.
+    """
+    columnas = dict()
+    for col_name, columna in frecuencias['columnas'].items():
+        fusionar_frecuencias(columna, max_distintos)
+        conteo, dtype = columna['conteo'], columna['dtype']
+
+        numerico = None
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            numerico = {'count': 0}
+            if columna['momentos'] is not None:
+                n, media, m2, minimo, maximo = columna['momentos']
+                numerico = {'count': n, 'mean': media, 'std': float(np.sqrt(m2 / (n - 1))) if n > 1 else np.nan,
+                            'min': minimo}
+                if columna['aproximado']:
+                    numerico.update(dict.fromkeys(['25%', '50%', '75%'], np.nan))
+                else:
+                    numerico.update(cuantiles_frecuencias(conteo.index.to_numpy(), conteo.to_numpy()))
+                numerico['max'] = maximo
+
+        top = ordenar_frecuencias(conteo).iloc[:top_k]
+        columnas[str(col_name)] = {
+            'dtype': str(dtype),
+            'nulos': int(columna['nulos']),
+            'distintos': int(columna['distintos']),
+            'aproximado': columna['aproximado'],
+            'numerico': numerico,
+            # Valores nativos de Python (las fechas como texto)
+            'top': [[v if isinstance(v, (bool, int, float, str)) else str(v), int(c)]
+                    for v, c in zip(top.index.tolist(), top.tolist())],
+        }
+
+    return {'filas': frecuencias['filas'], 'columnas': len(columnas), 'por_columna': columnas}
+
+def perfilar_df(df, top_k=10, max_distintos=MAX_DISTINTOS_PERFIL):
+    """
+    Perfil de un DataFrame en un único recorrido de los datos: tamaño, nulos, valores distintos, resumen numérico
+    y valores más frecuentes de cada columna (sustituye a "info", "describe", "isna().sum()", "unique" y
+    "value_counts" por separado).
+
+    Args:
+    -----
+    df [{pandas.DataFrame}] -- DataFrame.
+    top_k [{int}] -- Número de valores más frecuentes por columna.
+    max_distintos [{int}] -- Número máximo de valores distintos conservados por columna (ver "acumular_frecuencias").
+
+    Returns:
+    ------
+    perfil [{dict}] -- Perfil del DataFrame (ver "perfil_frecuencias").
+    """
+    frecuencias = acumular_frecuencias(None, df, max_distintos=max_distintos)
+    return perfil_frecuencias(frecuencias, top_k=top_k, max_distintos=max_distintos)
+
+def perfilar_csv(filename_dir, chunksize=1000000, top_k=10, max_distintos=MAX_DISTINTOS_PERFIL, cache_dir=None,
+                 usar_hash=False):
+    """
+    Perfil de un fichero csv sin formato (commercial_activity_df.csv, sociodemographic_df.csv o products_df.csv)
+    leyéndolo por bloques, de forma que no es necesario cargarlo completo en memoria. Las fechas se perfilan como
+    texto. Mientras ninguna columna supere "max_distintos" valores distintos, el perfil coincide con el del fichero
+    completo en memoria.
+
+    Args:
+    -----
+    filename_dir [{str}] -- Directorio de almacenamiento incluyendo el nombre fichero.
+    chunksize [{int}] -- Número de filas de cada bloque.
+    top_k [{int}] -- Número de valores más frecuentes por columna.
+    max_distintos [{int}] -- Número máximo de valores distintos conservados por columna (ver "acumular_frecuencias").
+    cache_dir [{str}] -- Directorio de la caché. Si se indica, el perfil se almacena junto a la caché columnar del
+                         fichero y se reutiliza mientras el fichero no cambie (ver "cache.cargar_json_con_cache").
+    usar_hash [{bool}] -- Validar la caché también con el hash del contenido del fichero.
+
+    Returns:
+    ------
+    perfil [{dict}] -- Perfil del fichero (ver "perfil_frecuencias").
+    """
+    if cache_dir is not None:
+        return cargar_json_con_cache(
+            filename_dir, cache_dir, 'perfil',
+            lambda filename: perfilar_csv(filename, chunksize=chunksize, top_k=top_k, max_distintos=max_distintos),
+            parametros={'top_k': top_k, 'max_distintos': max_distintos}, usar_hash=usar_hash)
+
+    frecuencias = None
+    with pd.read_csv(filename_dir, sep=',', encoding='utf-8-sig', chunksize=chunksize) as lector:
+        for bloque in lector:
+            frecuencias = acumular_frecuencias(frecuencias, bloque.drop('Unnamed: 0', axis=1, errors='ignore'),
+                                               max_distintos=max_distintos)
+
+    return perfil_frecuencias(frecuencias, top_k=top_k, max_distintos=max_distintos)
+
+def resumen_perfil(perfil):
+    """
+    Tabla resumen de un perfil: una fila por columna con su tipo, nulos, valores distintos y resumen numérico.
+
+    Args:
+    -----
+    perfil [{dict}] -- Perfil (ver "perfilar_df" o "perfilar_csv").
+
+    Returns:
+    ------
+    resumen [{pandas.DataFrame}] -- Resumen del perfil.
+    """
+    filas = []
+    for col_name, columna in perfil['por_columna'].items():
+        filas.append({
+            'columna': col_name,
+            'dtype': columna['dtype'],
+            'nulos': columna['nulos'],
+            'distintos': columna['distintos'],
+            'aproximado': columna['aproximado'],
+            **(columna['numerico'] or dict()),
+        })
+
+    return pd.DataFrame(filas).set_index('columna')
+
+def imprimir_perfil(perfil, columnas_frecuencias=()):
+    """
+    Imprime por pantalla un perfil: tamaño del dataset, resumen por columna y frecuencia relativa (sobre los valores
+    no nulos) de los valores más frecuentes de las columnas indicadas.
+
+    Args:
+    -----
+    perfil [{dict}] -- Perfil (ver "perfilar_df" o "perfilar_csv").
+    columnas_frecuencias [{list}] -- Columnas de las que mostrar los valores más frecuentes.
+    """
+    print('Tamaño del dataset')
+    print(f'\tSamples: {perfil["filas"]}')
+    print(f'\tFeatures: {perfil["columnas"]}')
     print(2 * '\n')
 
-def get_sociodemographic_df(filename_dir):
+    with pd.option_context('display.max_columns', None, 'display.width', None):
+        print('Resumen por columna')
+        print(resumen_perfil(perfil))
+        print(2 * '\n')
+
+    for col_name in columnas_frecuencias:
+        columna = perfil['por_columna'][col_name]
+        no_nulos = perfil['filas'] - columna['nulos']
+        top = pd.Series({valor: frecuencia / no_nulos for valor, frecuencia in columna['top']}, name=col_name,
+                        dtype=np.float64)
+        print(col_name)
+        print(top)
+        print(2 * '\n')
+
+def get_commercial_activity_df(filename_dir, cache_dir=None, usar_hash=False, clientes=None, indice_mes=False):
     """
-    Carga el fichero sociodemographic.csv y se encarga de aplicar el formato
+    Carga el fichero commercial_activity_df.csv y se encarga de aplicar el formato
     adecuado a las columnas que lo componen.
 
     Args:
     -----
     filename_dir [{str}] -- Directorio de almacenamiento incluyendo el nombre
                             fichero.
+    cache_dir [{str}] -- Directorio de la caché columnar. Si se indica, la primera carga almacena el dataset
+                         en formato binario (un .npy por columna) y las siguientes lo leen directamente con
+                         las columnas de texto como categóricas (ver "cache.cargar_con_cache").
+    usar_hash [{bool}] -- Validar la caché también con el hash del contenido del fichero.
+    clientes [{pandas.Index}] -- Diccionario de clientes (ver "crear_diccionario_clientes"). Si se indica,
+                                 pk_cid se codifica como int32 en lugar de texto.
+    indice_mes [{bool}] -- Si es True, añade la columna "indice_mes" (índice int16 del mes de pk_partition, ver
+                           "calcular_indice_mes").
 
     Returns:
     ------
-    df_sociodemographic [{pandas.DataFrame}] -- Fichero csv cargado en formato DataFrame
+    df_comm [{pandas.DataFrame}] -- Fichero csv cargado en formato DataFrame
     """
 
-    df_sociodemographic = pd.read_csv(filename_dir, sep=',', encoding='utf-8-sig')
-    df_sociodemographic.drop('Unnamed: 0', axis=1, inplace=True)
-    df_sociodemographic['pk_cid'] = df_sociodemographic.pk_cid.apply(str)
-    df_sociodemographic['pk_partition'] = pd.to_datetime(df_sociodemographic.pk_partition, format='%Y-%m-%d')
-    df_sociodemographic['region_code'] = df_sociodemographic.region_code.apply(str)
+    if cache_dir is not None:
+        df_comm = cargar_con_cache(filename_dir, cache_dir, get_commercial_activity_df, usar_hash=usar_hash)
+        df_comm = df_comm if clientes is None else formato_pk_cid(df_comm, clientes)
+        return incluir_indice_mes(df_comm) if indice_mes else df_comm
 
-    return df_sociodemographic
+    df_comm = pd.read_csv(filename_dir, sep=',', encoding='utf-8-sig')
+    df_comm.drop('Unnamed: 0', axis=1, inplace=True)
+    df_comm = formato_pk_cid(df_comm, clientes)
+    df_comm['pk_partition'], meses = parsear_fechas(df_comm['pk_partition'])
 
-def resume_sociodemographic_df(df_sd):
+    # Las fechas inexistentes (p.ej. 29 de febrero de 2015 o 2019) se reparan al último día del mes
+    df_comm['entry_date'], _ = parsear_fechas(df_comm['entry_date'])
+
+    return incluir_indice_mes(df_comm, meses) if indice_mes else df_comm
+
+def resume_commercial_activity_df(df_comm, top_k=10):
     """
-    Imprime por pantalla un resumen sobre las características principales del dataset "sociodemographic.csv"
+    Imprime por pantalla un resumen sobre las características principales del dataset "commercial_activity_df.csv"
+    a partir de su perfil, calculado en un único recorrido de los datos (ver "perfilar_df").
 
     Args:
-    df_sd [{pandas.DataFrame}] -- DataFrame obtenido con la función "get_sociodemographic_df"
     -----
+    df_comm [{pandas.DataFrame}] -- DataFrame obtenido con la función "get_commercial_activity_df".
+    top_k [{int}] -- Número de valores más frecuentes por columna.
+
+    Returns:
+    ------
+    perfil [{dict}] -- Perfil del dataset.
     """
+    perfil = perfilar_df(df_comm, top_k=top_k)
+    imprimir_perfil(perfil, columnas_frecuencias=['active_customer', 'segment'])
 
-    # Mostrar características principales del dataset
-    print('Tamaño del dataset')
-    print(f'\tSamples: {df_sd.shape[0]}')
-    print(f'\tFeatures: {df_sd.shape[1]}')
-    print(2 * '\n')
+    return perfil
 
-    # Número total de particiones en el dataframe
-    n_particiones = df_sd.pk_partition.value_counts().shape[0]
-    print(f'Número de particiones del histórico: {n_particiones}')
+def get_sociodemographic_df(filename_dir, cache_dir=None, usar_hash=False, clientes=None, indice_mes=False):
+    """
+    Carga el fichero sociodemographic.csv y se encarga de aplicar el formato
+    adecuado a las columnas que lo componen.
 
-    # Número de clientes únicos
-    clients_id = list(df_sd.pk_cid.unique())
-    print(f'Número de clientes únicos: {len(clients_id)}')
-    print(2 * '\n')
+    Args:
+    -----
+    filename_dir [{str}] -- Directorio de almacenamiento incluyendo el nombre
+                            fichero.
+    cache_dir [{str}] -- Directorio de la caché columnar. Si se indica, la primera carga almacena el dataset
+                         en formato binario (un .npy por columna) y las siguientes lo leen directamente con
+                         las columnas de texto como categóricas (ver "cache.cargar_con_cache").
+    usar_hash [{bool}] -- Validar la caché también con el hash del contenido del fichero.
+    clientes [{pandas.Index}] -- Diccionario de clientes (ver "crear_diccionario_clientes"). Si se indica,
+                                 pk_cid se codifica como int32 en lugar de texto.
+    indice_mes [{bool}] -- Si es True, añade la columna "indice_mes" (índice int16 del mes de pk_partition, ver
+                           "calcular_indice_mes").
 
-    # Información del dataframe
-    print('Información del DataFrame')
-    print(df_sd.info())
-    print(2 * '\n')
+    Returns:
+    ------
+    df_sociodemographic [{pandas.DataFrame}] -- Fichero csv cargado en formato DataFrame
+    """
 
-    # Descripción del dataframe
-    print('Descripción del dataset')
-    print(df_sd.describe())
-    print(2 * '\n')
+    if cache_dir is not None:
+        df_sociodemographic = cargar_con_cache(filename_dir, cache_dir, get_sociodemographic_df, usar_hash=usar_hash)
+        df_sociodemographic = (df_sociodemographic if clientes is None
+                               else formato_pk_cid(df_sociodemographic, clientes))
+        return incluir_indice_mes(df_sociodemographic) if indice_mes else df_sociodemographic
 
-    # Valores nulos
-    print('Valores nulos', df_sd.isna().sum(), sep=2 * '\n')
-    print(2 * '\n')
+    df_sociodemographic = pd.read_csv(filename_dir, sep=',', encoding='utf-8-sig')
+    df_sociodemographic.drop('Unnamed: 0', axis=1, inplace=True)
+    df_sociodemographic = formato_pk_cid(df_sociodemographic, clientes)
+    df_sociodemographic['pk_partition'], meses = parsear_fechas(df_sociodemographic['pk_partition'])
+    df_sociodemographic['region_code'] = df_sociodemographic.region_code.apply(str)
 
-    # Conteo de valores
-    print('Country')
-    print(df_sd['country_id'].value_counts(normalize=True))
-    print(2 * '\n')
+    return incluir_indice_mes(df_sociodemographic, meses) if indice_mes else df_sociodemographic
 
-    print('Gender')
-    print(df_sd['gender'].value_counts(normalize=True))
-    print(2 * '\n')
+def resume_sociodemographic_df(df_sd, top_k=10):
+    """
+    Imprime por pantalla un resumen sobre las características principales del dataset "sociodemographic.csv"
+    a partir de su perfil, calculado en un único recorrido de los datos (ver "perfilar_df").
 
-    print('Deceased')
-    print(df_sd['deceased'].value_counts(normalize=True))
-    print(2 * '\n')
+    Args:
+    -----
+    df_sd [{pandas.DataFrame}] -- DataFrame obtenido con la función "get_sociodemographic_df".
+    top_k [{int}] -- Número de valores más frecuentes por columna.
+
+    Returns:
+    ------
+    perfil [{dict}] -- Perfil del dataset.
+    """
+    perfil = perfilar_df(df_sd, top_k=top_k)
+    imprimir_perfil(perfil, columnas_frecuencias=['country_id', 'gender', 'deceased'])
+
+    return perfil
 
 def get_informacion_clientes_producto(filename):
     """
@@ -170,7 +798,7 @@ def get_informacion_clientes_producto(filename):
     try:
         # Leer
         df_cpi = pd.read_csv(filename, sep=';', encoding='utf-8-sig')
-        df_cpi['pk_partition'] = pd.to_datetime(df_cpi['pk_partition'], format='%Y-%m-%d')
+        df_cpi['pk_partition'], _ = parsear_fechas(df_cpi['pk_partition'])
         df_cpi.set_index('pk_partition', inplace=True)
 
         # Dividir el dataset en tres (clientes, productos y ratio).
@@ -221,7 +849,8 @@ def get_nivel_permanencia(filename):
     else:
         return df_bar
 
-def get_products_df(filename_dir):
+def get_products_df(filename_dir, cache_dir=None, usar_hash=False, compacto=False, clientes=None,
+                    indice_mes=False):
     """
     Carga el fichero products_df.csv y se encarga de aplicar el formato 
     adecuado a las columnas que lo componen.
@@ -230,63 +859,148 @@ def get_products_df(filename_dir):
     -----
     filename_dir [{str}] -- Directorio de almacenamiento incluyendo el nombre 
                             fichero.
+    cache_dir [{str}] -- Directorio de la caché columnar. Si se indica, la primera carga almacena el dataset
+                         en formato binario (un .npy por columna) y las siguientes lo leen directamente con
+                         las columnas de texto como categóricas (ver "cache.cargar_con_cache").
+    usar_hash [{bool}] -- Validar la caché también con el hash del contenido del fichero.
+    compacto [{bool}] -- Si es True, devuelve el dataset con el esquema compacto de "compactar_products_df"
+                         junto con las tablas de traducción de pk_cid y pk_partition. Combinado con cache_dir,
+                         el dataset completo se lee con memory-mapping antes de compactarlo.
+    clientes [{pandas.Index}] -- Diccionario de clientes (ver "crear_diccionario_clientes"). Si se indica,
+                                 pk_cid se codifica como int32 en lugar de texto.
+    indice_mes [{bool}] -- Si es True, añade la columna "indice_mes" (índice int16 del mes de pk_partition, ver
+                           "calcular_indice_mes").
     
     Returns:
     ------
     df_prod [{pandas.DataFrame}] -- Fichero csv cargado en formato DataFrame
+    (si compacto=True, tupla (df_prod, clientes, particiones))
     """
 
+    if compacto:
+        return compactar_products_df(get_products_df(filename_dir, cache_dir=cache_dir, usar_hash=usar_hash),
+                                     clientes=clientes)
+
+    if cache_dir is not None:
+        df_prod = cargar_con_cache(filename_dir, cache_dir, get_products_df, usar_hash=usar_hash)
+        df_prod = df_prod if clientes is None else formato_pk_cid(df_prod, clientes)
+        return incluir_indice_mes(df_prod) if indice_mes else df_prod
+
     # Cargar datos
     df_prod = pd.read_csv(filename_dir, sep=',', encoding='utf-8-sig', header=0)
+
+    return formato_products_df(df_prod, clientes=clientes, indice_mes=indice_mes)
+
+def formato_products_df(df_prod, clientes=None, indice_mes=False):
+    """
+    Aplica el formato adecuado a las columnas del fichero products_df.csv (o a un bloque del mismo).
+
+    Args:
+    -----
+    df_prod [{pandas.DataFrame}] -- Fichero csv leído con pandas.read_csv.
+    clientes [{pandas.Index}] -- Diccionario de clientes (ver "crear_diccionario_clientes").
+    indice_mes [{bool}] -- Si es True, añade la columna "indice_mes" (índice int16 del mes de pk_partition, ver
+                           "calcular_indice_mes").
+
+    Returns:
+    ------
+    df_prod [{pandas.DataFrame}] -- DataFrame con formato.
+    """
     df_prod.drop('Unnamed: 0', axis=1, inplace=True)
 
-    # Añadir formato adeacuado a las columnas
-    df_prod['pk_partition'] = pd.to_datetime(df_prod['pk_partition'], format='%Y-%m-%d')
-    df_prod['pk_cid'] = df_prod['pk_cid'].apply(str)
+    # Añadir formato adeacuado a las columnas
+    df_prod['pk_partition'], meses = parsear_fechas(df_prod['pk_partition'])
+    df_prod = formato_pk_cid(df_prod, clientes)
+
+    # Rename
+    df_prod.rename({'em_acount':'em_account'}, axis=1,inplace=True)
+
+    return incluir_indice_mes(df_prod, meses) if indice_mes else df_prod
+
+def get_products_df_por_bloques(filename_dir, chunksize=1000000, clientes=None, indice_mes=False):
+    """
+    Lectura por bloques del fichero products_df.csv. Permite procesar ficheros que no caben en memoria
+    (ver "agregado_products_csv").
+
+    Args:
+    -----
+    filename_dir [{str}] -- Directorio de almacenamiento incluyendo el nombre fichero.
+    chunksize [{int}] -- Número de filas de cada bloque.
+    clientes [{pandas.Index}] -- Diccionario de clientes (ver "crear_diccionario_clientes").
+    indice_mes [{bool}] -- Si es True, añade la columna "indice_mes" (índice int16 del mes de pk_partition, ver
+                           "calcular_indice_mes").
+
+    Returns:
+    ------
+    bloques [{generator}] -- Bloques del fichero (pandas.DataFrame) con el formato de "get_products_df".
+    """
+    with pd.read_csv(filename_dir, sep=',', encoding='utf-8-sig', header=0, chunksize=chunksize) as lector:
+        for bloque in lector:
+            yield formato_products_df(bloque, clientes=clientes, indice_mes=indice_mes)
+
+def compactar_products_df(df_prod, clientes=None):
+    """
+    Convierte el dataset de productos a un esquema compacto:
+
+        - pk_cid. Código int32 del cliente (posición en "clientes").
+        - pk_partition. Índice int16 del mes de ingesta (ver "calcular_indice_mes").
+        - Productos. Estado uint8 (0/1). Los valores nulos se establecen a 0 (ver "nulos_productos").
+
+    Frente a las columnas float64 y el pk_cid como str, el dataset ocupa entre 8 y 10 veces menos memoria.
+
+    Args:
+    -----
+    df_prod [{pandas.DataFrame}] -- DataFrame obtenido con la función "get_products_df".
+    clientes [{pandas.Index}] -- Diccionario de clientes (ver "crear_diccionario_clientes"). Si se indica, los
+                                 códigos de cliente son los del diccionario compartido.
+
+    Returns:
+    ------
+    df_compacto [{pandas.DataFrame}] -- Dataset de productos con el esquema compacto.
+    clientes [{pandas.Index}] -- pk_cid de cada código de cliente (clientes[codigo]).
+    particiones [{pandas.Series}] -- Fecha de ingesta de cada índice de mes (particiones[indice]).
+    """
+    if clientes is None:
+        codigos_cliente, clientes = pd.factorize(df_prod['pk_cid'], sort=True)
+    else:
+        codigos_cliente = codificar_clientes(df_prod['pk_cid'], clientes)
+    meses = df_prod['indice_mes'].to_numpy() if 'indice_mes' in df_prod.columns else \
+        calcular_indice_mes(df_prod['pk_partition'])
+
+    columnas = {
+        'pk_cid': codigos_cliente.astype(np.int32),
+        'pk_partition': meses,
+    }
+    for producto in df_prod.columns.drop(COLUMNAS_CLAVE, errors='ignore'):
+        columnas[producto] = df_prod[producto].fillna(0).to_numpy(dtype=np.uint8)
 
+    df_compacto = pd.DataFrame(columnas, index=df_prod.index)
 
-    # Rename
-    df_prod.rename({'em_acount':'em_account'}, axis=1,inplace=True)
+    clientes = pd.Index(np.asarray(clientes), name='pk_cid')
+    particiones = pd.Series(df_prod['pk_partition'].unique(), name='pk_partition')
+    particiones.index = pd.Index(calcular_indice_mes(particiones), name='indice_mes')
 
-    return df_prod
+    return df_compacto, clientes, particiones.sort_index()
 
-def resume_products_df(df_prod):
+def resume_products_df(df_prod, top_k=10):
     """
     Imprime por pantalla un resumen sobre las características principales del dataset "products_df.csv"
-    
+    a partir de su perfil, calculado en un único recorrido de los datos (ver "perfilar_df").
+
     Args:
-    df [{pandas.DataFrame}] -- DataFrame obtenido con la función "get_products_df"
     -----
+    df_prod [{pandas.DataFrame}] -- DataFrame obtenido con la función "get_products_df".
+    top_k [{int}] -- Número de valores más frecuentes por columna.
+
+    Returns:
+    ------
+    perfil [{dict}] -- Perfil del dataset.
     """
-    
-    # Mostrar características principales del dataset
-    print('Tamaño del dataset')
-    print(f'\tSamples: {df_prod.shape[0]}')
-    print(f'\tFeatures: {df_prod.shape[1]}')
-    print(2*'\n')
-    
-    # Número total de particiones en el dataframe
-    n_particiones = df_prod.pk_partition.value_counts().shape[0]
-    print(f'Número de particiones del histórico: {n_particiones}')
-    
-    # Número de clientes únicos
-    clients_id = list(df_prod.pk_cid.unique())
-    print(f'Número de clientes únicos: {len(clients_id)}')
-    print(2*'\n')
-    
-    # Información del dataframe
-    print('Información del DataFrame')
-    print(df_prod.info())
-    print(2*'\n')
-    
-    # Descripción del dataframe
-    print('Descripción del dataset')
-    print(df_prod.describe().T)
-    print(2*'\n')
-    
-    # Valores nulos
-    print('Valores nulos', df_prod.isna().sum(), sep=2*'\n')
-      
+    perfil = perfilar_df(df_prod, top_k=top_k)
+    imprimir_perfil(perfil, columnas_frecuencias=())
+
+    return perfil
+
 def listar_productos(df_prod):
     """
     Listar productos disponibles del fichero products_df.csv
@@ -296,8 +1010,7 @@ def listar_productos(df_prod):
     df [{pandas.DataFrame}] -- DataFrame obtenido con la función "get_products_df"
     """
     
-    no_products_cols = ['pk_cid', 'pk_partition']
-    productos = df_prod.drop(no_products_cols, axis=1).columns.to_list()
+    productos = df_prod.columns.drop(COLUMNAS_CLAVE, errors='ignore').to_list()
     
     lista_productos = []
     print(f"Productos disponibles: {len(productos)}",end=2*'\n')
@@ -307,7 +1020,7 @@ def listar_productos(df_prod):
         
     return lista_productos
         
-def nulos_productos(df_prod):
+def nulos_productos(df_prod, downcast=False, show_msg=False):
     """
     Establece a 0 los valores nulos encontrados en los productos "payroll" y "pension_plan" del dataset de products_df.csv
     Dado que se trata de un dataset de clientes, se entiendo que los valores nulos indican que dicho cliente no tiene activado 
@@ -316,69 +1029,86 @@ def nulos_productos(df_prod):
     Dicho de otra forma, un valor nulo conlleva:
         - Continúa siendo cliente dado que aparece en el registro.
         - No tiene activado el producto y se establece el valor nulo a 0.
+
+    El número de nulos de cada columna se calcula una única vez y solo se modifican (in-place) las columnas
+    que contienen valores nulos.
         
         
     Args:
     -----
     df [{pandas.DataFrame}] -- DataFrame obtenido con la función "get_products_df" con columnas de valores nulos.
+    downcast [{bool}] -- Si es True, las columnas corregidas se convierten al menor tipo entero sin signo
+                         posible (uint8 para los productos).
+    show_msg [{bool}] -- Si es True, imprime por pantalla los valores nulos corregidos y restantes.
     
     Returns:
     -----
     df_prod [{pandas.DataFrame}] -- DataFrame sin valores nulos.
     """
     
+    # Número de valores nulos por columna
+    nulos = len(df_prod) - df_prod.count()
+    columnas_nulos = nulos[nulos > 0].index.to_list()
+
     # Asignar valores nulos a 0 (cliente no activo)
-    for col_name in df_prod.columns:
-        df_prod.loc[(df_prod[col_name].isna()), col_name] = 0
+    if columnas_nulos:
+        df_prod.fillna(dict.fromkeys(columnas_nulos, 0), inplace=True)
+
+        if downcast:
+            for col_name in columnas_nulos:
+                df_prod[col_name] = pd.to_numeric(df_prod[col_name], downcast='unsigned')
 
-    print(f'Total de valores nulos:', df_prod.isna().sum(), sep=2*'\n')
+    if show_msg:
+        print(f'Valores nulos corregidos:', nulos[columnas_nulos], sep=2*'\n')
+        print(f'Total de valores nulos:', len(df_prod) - df_prod.count(), sep=2*'\n')
     
     return df_prod
 
-def registro_clientes(df_prod):
+def registro_clientes(df_prod, sparse=False):
     """
     Función que calcula si el cliente aparece o no en la bbdd para cada fecha de ingesta de datos.
     
     El resultado se obtiene situando en las filas los pk_cid de cada uno de los clientes y en 
     las columnas la fecha de ingesta. Si el cliente aparece en dicha fecha, se completa con un 1, si
     no aparece, se completará con un 0.
+
+    La matriz se construye en una única pasada asignando a cada fila su código de cliente y de fecha de
+    ingesta (pandas.factorize) y marcando con un 1 las posiciones (cliente, fecha) encontradas.
     
     Args:
     ------
     df_prod [{pandas.DataFrame}] -- DataFrame obtenido con la función "get_products_df" con columnas de valores nulos.
+    sparse [{bool}] -- Si es True, el registro se almacena como matriz dispersa (requiere scipy). Indicado cuando
+                       la mayoría de clientes aparecen pocos meses.
 
     
     Returns:
     ------
-    registro_clientes [{pandas.DataFrame}] -- Registro de clientes mes a mes
+    registro_clientes [{pandas.DataFrame}] -- Registro de clientes mes a mes (uint8, o Sparse[int32] si sparse=True)
     """
     
-    # Clientes y particiones únicas
-    clientes = df_prod['pk_cid'].unique()
-    particiones = df_prod['pk_partition'].unique()
-
-    # Inicialización del dataframe (todos los valores están establecidos en NaN)
-    registro_clientes = pd.DataFrame(
-        columns = particiones, 
-        index = clientes,
-        dtype=int
-    )
-    
-    # Bucle iterativo
-    for fecha_ingesta in particiones:
-        # Seleccionar fecha_ingesta
-        prod_fi = df_prod.loc[df_prod['pk_partition'] == fecha_ingesta]
+    # Códigos de cliente y fecha de ingesta (en orden de aparición)
+    codigos_cliente, clientes = pd.factorize(df_prod['pk_cid'])
+    codigos_particion, particiones = pd.factorize(df_prod['pk_partition'])
+    dimensiones = (len(clientes), len(particiones))
+
+    if sparse:
+        from scipy import sparse as sp
 
-        # Obtener todos los pk_cid de la fecha de ingesta
-        clientes_fi = prod_fi['pk_cid']
+        # int32: pandas no amplía el tipo al sumar columnas dispersas (uint8 desbordaría)
+        registro = sp.coo_matrix(
+            (np.ones(len(codigos_cliente), dtype=np.int32), (codigos_cliente, codigos_particion)),
+            shape=dimensiones
+        ).tocsr()
+        registro.data[:] = 1  # Filas duplicadas (cliente, fecha)
 
-        # Indicar con el valor 1 los clientes que se encuentran en esa fecha y 0 en cc.
-        clientes_encontrados = registro_clientes.index.isin(clientes_fi)
-        clientes_no_encontrados = ~registro_clientes.index.isin(clientes_fi)
+        registro_clientes = pd.DataFrame.sparse.from_spmatrix(registro, index=clientes, columns=particiones)
 
-        # Asignar el valor
-        registro_clientes.loc[clientes_encontrados, fecha_ingesta] = 1
-        registro_clientes.loc[clientes_no_encontrados, fecha_ingesta] = 0
+    else:
+        registro = np.zeros(dimensiones, dtype=np.uint8)
+        registro[codigos_cliente, codigos_particion] = 1
+
+        registro_clientes = pd.DataFrame(registro, index=clientes, columns=particiones)
         
     return registro_clientes
 
@@ -396,24 +1126,7 @@ def contratacion_general(df_prod):
     ------
     contratacion_gen [{pandas.DataFrame}] -- Indice de contratacion.
     """
-    
-    columnas_ordenadas = [
-        'pk_cid','pk_partition','short_term_deposit', 'loans', 
-        'mortgage', 'funds', 'securities', 'long_term_deposit', 
-        'em_account_pp', 'credit_card', 'payroll', 'pension_plan', 
-        'payroll_account', 'emc_account', 'debit_card', 'em_account_p', 'em_account', 
-    ]
-
-    contratacion_gen = df_prod.copy()
-    contratacion_gen = contratacion_gen[columnas_ordenadas].set_index(['pk_cid', 'pk_partition'])
-
-    contratacion_gen = contratacion_gen.describe().T.sort_values('mean', ascending=False)[['mean']]
-    contratacion_gen.rename(
-    {
-        'mean': 'total',
-    }, axis=1, inplace=True)
-    
-    return contratacion_gen
+    return contratacion_general_agregado(agregar_productos(df_prod))
 
 def contratacion_anual(df_prod):
     """
@@ -429,25 +1142,7 @@ def contratacion_anual(df_prod):
     ------
     contratacion_anual [{pandas.DataFrame}] -- Indice de contratacion anual
     """
-    
-    columnas_ordenadas = [
-        'year', 'short_term_deposit', 'loans', 
-        'mortgage', 'funds', 'securities', 'long_term_deposit', 
-        'em_account_pp', 'credit_card', 'payroll', 'pension_plan', 
-        'payroll_account', 'emc_account', 'debit_card', 'em_account_p', 'em_account', 
-    ]
-
-    # Indice contratación anual
-    contratacion_anual = df_prod.copy()
-    contratacion_anual['year'] = contratacion_anual['pk_partition'].dt.year
-    contratacion_anual.set_index(['pk_cid', 'pk_partition'], inplace=True)
-    contratacion_anual = contratacion_anual[columnas_ordenadas]
-
-    # Pivot table
-    contratacion_anual=contratacion_anual.pivot_table(index='year',
-                                                    aggfunc=np.mean).T
-    
-    return contratacion_anual
+    return contratacion_anual_agregado(agregar_productos(df_prod))
 
 def contratacion_mensual(df_prod):
     """
@@ -463,46 +1158,287 @@ def contratacion_mensual(df_prod):
     ------
     contratacion mensual [{pandas.DataFrame}] -- Indice de contratacion mensual
     """
-    lista_productos =[
-        'short_term_deposit', 'loans', 
-        'mortgage', 'funds', 'securities', 'long_term_deposit', 
-        'em_account_pp', 'credit_card', 'payroll', 'pension_plan', 
-        'payroll_account', 'emc_account', 'debit_card', 'em_account_p', 'em_account', 
-    ]
+    # Fechas de ingesta en orden de aparición (columnas del índice mensual)
+    return contratacion_mensual_agregado(agregar_productos(df_prod, sort=False))
 
-    df_prod = df_prod.copy()
-    partitions = df_prod['pk_partition'].unique()
+def indice_particiones(df_prod, sort=True):
+    """
+    Índice fecha de ingesta -> rango de filas. Las filas se ordenan por fecha de ingesta una única vez (si el
+    dataset ya está ordenado no se reordena), de forma que las filas de cada fecha de ingesta ocupan un rango
+    contiguo [limites[i], limites[i + 1]).
 
-    contratacion_mensual = pd.DataFrame(index=lista_productos, columns=partitions)
+    Args:
+    ------
+    df_prod [{pandas.DataFrame}] -- DataFrame obtenido con la función "get_products_df".
+    sort [{bool}] -- Ordenar las fechas de ingesta. Si es False, se mantiene el orden de aparición.
 
-    for fecha_ingesta in partitions:
-        contratacion_mensual[fecha_ingesta] = df_prod.loc[df_prod['pk_partition']==fecha_ingesta].set_index(['pk_cid', 'pk_partition']).mean()    
+    Returns:
+    ------
+    particiones [{pandas.Index}] -- Fechas de ingesta.
+    orden [{numpy.ndarray}] -- Permutación que ordena las filas por fecha de ingesta (None si ya están ordenadas).
+    limites [{numpy.ndarray}] -- Inicio del rango de filas de cada fecha de ingesta (y fin de la última).
+    """
+    codigos, particiones = pd.factorize(df_prod['pk_partition'], sort=sort)
 
-    return contratacion_mensual
-    
-def indice_contratacion(df_prod):
+    orden = None
+    if (np.diff(codigos) < 0).any():
+        orden = np.argsort(codigos, kind='stable')
+
+    limites = np.zeros(len(particiones) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codigos, minlength=len(particiones)), out=limites[1:])
+
+    return particiones, orden, limites
+
+def agregar_productos(df_prod, sort=True):
     """
-    Cálcula el índice de contratación general, anual y mensual.
-    
+    Calcula, para cada fecha de ingesta y producto, la suma de estados (clientes con el producto activo) y el número
+    de valores no nulos. A partir de este agregado se obtienen los índices de contratación y el número de clientes
+    activos y no activos sin volver a recorrer el dataset.
+
     Args:
     ------
-    df_prod [{pandas.DataFrame}] -- DataFrame obtenido con la función "get_products_df" con columnas de valores nulos.
+    df_prod [{pandas.DataFrame}] -- DataFrame obtenido con la función "get_products_df" (o un bloque del mismo).
+    sort [{bool}] -- Ordenar las fechas de ingesta. Si es False, se mantiene el orden de aparición.
+
+    Returns:
+    ------
+    agregado [{pandas.DataFrame}] -- Agregado por fecha de ingesta. Columnas (producto, 'sum' | 'count').
+    """
+    particiones, orden, limites = indice_particiones(df_prod, sort=sort)
+
+    agregado = dict()
+    if len(particiones):
+        for producto in LISTA_PRODUCTOS:
+            valores = df_prod[producto].to_numpy(dtype=float)
+            if orden is not None:
+                valores = valores[orden]
+
+            # Reducción de cada rango contiguo de filas
+            nulos = np.isnan(valores)
+            agregado[(producto, 'sum')] = np.add.reduceat(np.where(nulos, 0, valores), limites[:-1])
+            agregado[(producto, 'count')] = np.add.reduceat(~nulos, limites[:-1], dtype=np.int64)
+
+    agregado = pd.DataFrame(agregado, index=pd.Index(particiones), columns=pd.MultiIndex.from_product([LISTA_PRODUCTOS, ['sum', 'count']]))
+
+    return agregado.astype(np.int64)
+
+def acumular_agregado(agregado, agregado_bloque):
+    """
+    Acumula el agregado de un nuevo bloque de datos (ver "agregar_productos").
+
+    Args:
+    ------
+    agregado [{pandas.DataFrame}] -- Agregado acumulado (None si es el primer bloque).
+    agregado_bloque [{pandas.DataFrame}] -- Agregado del nuevo bloque.
+
+    Returns:
+    ------
+    agregado [{pandas.DataFrame}] -- Agregado acumulado.
+    """
+    if agregado is None:
+        return agregado_bloque
+
+    return agregado.add(agregado_bloque, fill_value=0).astype(np.int64)
+
+def agregado_products_csv(filename_dir, chunksize=1000000, rellenar_nulos=True):
+    """
+    Calcula el agregado del fichero products_df.csv leyéndolo por bloques, de forma que la memoria necesaria
+    no depende del tamaño del fichero.
+
+    Args:
+    ------
+    filename_dir [{str}] -- Directorio de almacenamiento incluyendo el nombre fichero.
+    chunksize [{int}] -- Número de filas de cada bloque.
+    rellenar_nulos [{bool}] -- Aplicar "nulos_productos" a cada bloque.
+
+    Returns:
+    ------
+    agregado [{pandas.DataFrame}] -- Agregado por fecha de ingesta (ver "agregar_productos").
+    """
+    agregado = None
+    for bloque in get_products_df_por_bloques(filename_dir, chunksize=chunksize):
+        if rellenar_nulos:
+            nulos_productos(bloque)
+        agregado = acumular_agregado(agregado, agregar_productos(bloque))
+
+    return agregado
+
+def actualizar_agregado(agregado, df_nuevo):
+    """
+    Incorpora al agregado una o varias fechas de ingesta nuevas. El coste es proporcional al número de filas
+    nuevas: el histórico no se vuelve a recorrer.
+
+    Cada fecha de ingesta de "df_nuevo" debe estar completa. Si alguna ya existía en el agregado, se sustituye
+    (volver a cargar un mes no duplica sus valores).
+
+    Args:
+    ------
+    agregado [{pandas.DataFrame}] -- Agregado por fecha de ingesta (ver "agregar_productos" y "get_agregado").
+    df_nuevo [{pandas.DataFrame}] -- Nuevas fechas de ingesta con el formato de "get_products_df" sin valores nulos.
+
+    Returns:
+    ------
+    agregado [{pandas.DataFrame}] -- Agregado actualizado.
+    """
+    agregado_nuevo = agregar_productos(df_nuevo)
+
+    if agregado is None:
+        return agregado_nuevo
+
+    agregado = agregado.drop(agregado_nuevo.index, errors='ignore')
+
+    return pd.concat([agregado, agregado_nuevo]).sort_index()
+
+def guardar_agregado(agregado, filename):
+    """
+    Almacena el agregado por fecha de ingesta en un fichero csv.
+
+    Args:
+    ------
+    agregado [{pandas.DataFrame}] -- Agregado por fecha de ingesta.
+    filename [{str}] -- Directorio del fichero csv.
+    """
+    agregado.rename_axis('pk_partition').to_csv(filename, sep=';', encoding='utf-8-sig')
+
+def get_agregado(filename):
+    """
+    Lectura del agregado por fecha de ingesta almacenado con "guardar_agregado".
+
+    Args:
+    ------
+    filename [{str}] -- Directorio del fichero csv.
+
+    Returns:
+    ------
+    agregado [{pandas.DataFrame}] -- Agregado por fecha de ingesta.
+    """
+    agregado = pd.read_csv(filename, sep=';', encoding='utf-8-sig', header=[0, 1], index_col=0)
+    agregado.index = pd.to_datetime(agregado.index, format='%Y-%m-%d')
+
+    return agregado.rename_axis(None).astype(np.int64)
+
+def comprobar_agregado(agregado, df_prod):
+    """
+    Comprueba que los índices de contratación obtenidos a partir del agregado coinciden con el cálculo completo
+    ("indice_contratacion") sobre el dataset de productos.
+
+    Args:
+    ------
+    agregado [{pandas.DataFrame}] -- Agregado por fecha de ingesta.
+    df_prod [{pandas.DataFrame}] -- DataFrame obtenido con la función "get_products_df" sin valores nulos.
+
+    Returns:
+    ------
+    correcto [{bool}] -- True si ambos resultados coinciden.
+    """
+    contratacion = indice_contratacion_agregado(agregado)
+    contratacion_completa = indice_contratacion(df_prod)
+
+    return (
+        contratacion.index.equals(contratacion_completa.index)
+        and contratacion.columns.equals(contratacion_completa.columns)
+        and np.allclose(contratacion.to_numpy(dtype=float), contratacion_completa.to_numpy(dtype=float), equal_nan=True)
+    )
+
+def separar_agregado(agregado):
+    """
+    Separa el agregado por fecha de ingesta en sumas y conteos (fechas de ingesta x productos).
+
+    Args:
+    ------
+    agregado [{pandas.DataFrame}] -- Agregado por fecha de ingesta (ver "agregar_productos").
+
+    Returns:
+    ------
+    sumas [{pandas.DataFrame}] -- Número de clientes con valor 1.
+    conteos [{pandas.DataFrame}] -- Número de valores no nulos.
+    """
+    return agregado.xs('sum', axis=1, level=1), agregado.xs('count', axis=1, level=1)
+
+def contratacion_general_agregado(agregado):
+    """
+    Indice de contratación general a partir del agregado por fecha de ingesta (ver "contratacion_general").
+    """
+    sumas, conteos = separar_agregado(agregado)
+
+    return (sumas.sum() / conteos.sum()).sort_values(ascending=False).to_frame('total')
+
+def contratacion_anual_agregado(agregado):
+    """
+    Indice de contratación anual a partir del agregado por fecha de ingesta (ver "contratacion_anual").
+    """
+    sumas, conteos = separar_agregado(agregado)
+    year = sumas.index.year.rename('year')
+
+    return (sumas.groupby(year).sum() / conteos.groupby(year).sum()).T.sort_index()
+
+def contratacion_mensual_agregado(agregado):
+    """
+    Indice de contratación mensual a partir del agregado por fecha de ingesta (ver "contratacion_mensual").
+    """
+    sumas, conteos = separar_agregado(agregado)
+
+    return (sumas / conteos).T
+
+def indice_contratacion_agregado(agregado):
+    """
+    Cálcula el índice de contratación general, anual y mensual a partir del agregado por fecha de ingesta
+    (ver "agregar_productos").
+
+    Args:
+    ------
+    agregado [{pandas.DataFrame}] -- Agregado por fecha de ingesta.
 
-    
     Returns:
     ------
     nivel_contratacion [{pandas.DataFrame}] -- Indice de contratacion general, anual y mensual.
     """
-    cont_gen = contratacion_general(df_prod = df_prod)
-    cont_ann = contratacion_anual(df_prod = df_prod)
-    cont_men = contratacion_mensual(df_prod = df_prod)
-    cont_men.columns = cont_men.columns.strftime('%Y-%m') 
-    
+    cont_gen = contratacion_general_agregado(agregado)
+    cont_ann = contratacion_anual_agregado(agregado)
+    cont_men = contratacion_mensual_agregado(agregado)
+    cont_men.columns = cont_men.columns.strftime('%Y-%m')
+
     # Unir resultados
     contratacion = pd.DataFrame(index=cont_gen.index)
     contratacion = contratacion.join([cont_gen, cont_ann, cont_men])
+
+    return contratacion
+
+def clientes_producto_agregado(agregado):
+    """
+    Número de clientes activos (1) y no activos (0) por cada producto y mes de ingesta a partir del agregado
+    por fecha de ingesta (ver "agregar_productos").
+
+    Args:
+    ------
+    agregado [{pandas.DataFrame}] -- Agregado por fecha de ingesta.
+
+    Returns:
+    ------
+    clientes_activos [{pandas.DataFrame}] -- Número de clientes con valor 1 por mes para cada producto.
+    clientes_no_activos [{pandas.DataFrame}] -- Número de clientes con valor 0 por mes para cada producto.
+    """
+    clientes_activos, conteos = separar_agregado(agregado)
+    clientes_no_activos = conteos - clientes_activos
+
+    return clientes_activos, clientes_no_activos
+
+def indice_contratacion(df_prod):
+    """
+    Cálcula el índice de contratación general, anual y mensual. Los tres índices se obtienen del mismo agregado
+    por fecha de ingesta, de forma que el dataset se recorre una única vez.
+    
+    Args:
+    ------
+    df_prod [{pandas.DataFrame}] -- DataFrame obtenido con la función "get_products_df" con columnas de valores nulos.
+
     
-    return contratacion    
+    Returns:
+    ------
+    nivel_contratacion [{pandas.DataFrame}] -- Indice de contratacion general, anual y mensual.
+    """
+    # Fechas de ingesta en orden de aparición (columnas del índice mensual)
+    return indice_contratacion_agregado(agregar_productos(df_prod, sort=False))
 
 def clientes_producto(df_prod):
     """
@@ -515,34 +1451,19 @@ def clientes_producto(df_prod):
     
     Returns:
     ------
-    df_informacion [{pandas.DataFrame}] -- Información de clientes y productos.
-    df_productos [{pandas.DataFrame}] -- Número de clientes con valor 1 por mes para cada producto.
+    clientes_activos [{pandas.DataFrame}] -- Número de clientes con valor 1 por mes para cada producto.
+    clientes_no_activos [{pandas.DataFrame}] -- Número de clientes con valor 0 por mes para cada producto.
 
     """
-    # Listado de productos
-    lista_productos = [
-        'short_term_deposit', 'loans', 'mortgage', 'funds', 'securities',
-        'long_term_deposit', 'em_account_pp', 'credit_card', 'payroll', 
-        'pension_plan', 'payroll_account', 'emc_account', 'debit_card', 
-        'em_account_p', 'em_account'
-    ]
-
-    #Lista de fechas de ingesta
-    partitions = df_prod['pk_partition'].unique()
-
-    # Inicialización de salida
-    clientes_activos = pd.DataFrame(index=partitions, columns=lista_productos)
-    clientes_no_activos = clientes_activos.copy()
+    # Agregación por fecha de ingesta de todos los productos a la vez (suma y número de registros no nulos)
+    agregado = agregar_productos(df_prod, sort=False)
 
     # Cálculo
-    for p in lista_productos:
-        for fecha_ingesta in partitions:
-            clientes_activos.loc[fecha_ingesta][p] = df_prod.loc[df_prod['pk_partition']==fecha_ingesta][p].sum()
-            clientes_no_activos.loc[fecha_ingesta][p] = df_prod.loc[df_prod['pk_partition']==fecha_ingesta][p].count() - clientes_activos.loc[fecha_ingesta][p]
+    clientes_activos, clientes_no_activos = clientes_producto_agregado(agregado)
 
     return clientes_activos, clientes_no_activos
 
-def analizar_productos_clientes(df_prod, ca):
+def analizar_productos_clientes(df_prod, ca, registro=None):
     """
     Añade información al dataset de clientes (activos) de releveancia:
 
@@ -567,20 +1488,22 @@ def analizar_productos_clientes(df_prod, ca):
     Args:
     ------
         df_prod [{pandas.DataFrame}] -- DataFrame obtenido con la función "get_products_df" sin columnas de valores nulos.
-        df_ca [{pandas.DataFrame}] --
+        df_ca [{pandas.DataFrame}] -- Clientes activos por producto y fecha (ver "clientes_producto").
+        registro [{pandas.DataFrame}] -- Registro de clientes ya calculado con "registro_clientes" sobre df_prod. Si no
+                                         se indica, se calcula a partir de df_prod.
 
     Returns:
         df_informacion [{pandas.DataFrame}] -- Información de clientes y productos.
     """
-    df = df_prod.copy()
     df_ca = ca.copy()
 
     # Clientes totales por fecha.
-    registro = registro_clientes(df)
+    if registro is None:
+        registro = registro_clientes(df_prod)
     clientes_totales = clientes_fecha(registro=registro, show_msg=False)
 
     # Calcular número de clientes.
-    df_ca['numero_clientes'] = clientes_totales.values
+    df_ca['numero_clientes'] = clientes_totales['total'].values
 
     # Productos activos por fecha.
     df_ca['productos_contratados'] = df_ca.sum(axis=1) - df_ca['numero_clientes']
@@ -615,6 +1538,26 @@ def analizar_productos_clientes(df_prod, ca):
 
     return df_informacion
 
+def sumar_registro(registro, axis):
+    """
+    Suma el registro de clientes (denso o disperso, ver "registro_clientes") por columnas (axis=0, clientes por
+    fecha) o por filas (axis=1, meses por cliente).
+
+    Args:
+    -----
+    registro {[dataframe]} -- Registro de clientes.
+    axis {[int]} -- Eje de la suma.
+
+    Returns:
+    -----
+    suma {[numpy.ndarray]} -- Suma int64.
+    """
+    if len(registro.columns) and all(isinstance(dtype, pd.SparseDtype) for dtype in registro.dtypes):
+        matriz = registro.sparse.to_coo()
+        return np.asarray(matriz.sum(axis=axis, dtype=np.int64)).ravel()
+
+    return registro.to_numpy().sum(axis=axis, dtype=np.int64)
+
 def clientes_fecha(registro, show_msg=True):
     """
     Aplica un sumatorio a cada fecha para conocer el número de clientes
@@ -623,26 +1566,21 @@ def clientes_fecha(registro, show_msg=True):
     Arguments:
     ----------
     registro {[dataframe]} -- Registro de clientes.
+    show_msg {[bool]} -- Imprimir por pantalla el número de clientes de cada fecha.
     
     Returns:
     ----------
     clientes_totales {[dataframe]} -- DataFrame con el número de clientes por 
-                                      fecha.
+                                      fecha (columna "total", int64).
     """
     
-    clientes = pd.DataFrame(index=registro.columns.to_list())
-    clientes['total'] = np.nan
+    clientes = pd.DataFrame({'total': sumar_registro(registro, axis=0)}, index=registro.columns)
 
-    partitions = registro.columns.to_list()
-
-    for fecha_ingesta in partitions:
-        num_clientes = registro[fecha_ingesta].sum()
-        if show_msg:
+    if show_msg:
+        for fecha_ingesta, num_clientes in clientes['total'].items():
             print(f'{fecha_ingesta} -> {num_clientes} clientes')
-        clientes.loc[fecha_ingesta] = num_clientes
 
-    if not show_msg:
-        return clientes
+    return clientes
 
 def promedio_permanencia(nivel_permanencia):
     """
@@ -678,19 +1616,20 @@ def nivel_permanencia(registro, periodo):
     Returns:
     nvp {[pandas.DataFrame]} -- Nivel de permanencia de los clientes
     """
-    # Período de tiempo
-    nivel_perm = pd.DataFrame(columns=['pk_cid', 'numero_meses', 'score'])
-    nivel_perm['pk_cid'] = registro.index  #  El indice del registro corresponde con el pk_cid del cliente.
-
     # Formula
-    mc = registro.sum(axis=1)
+    mc = sumar_registro(registro, axis=1)
     nvp = mc / periodo
 
-    #  Almacenamiento
-    nivel_perm['numero_meses'] = mc.values
-    nivel_perm['score'] = nvp.values
+    #  Almacenamiento (el indice del registro corresponde con el pk_cid del cliente)
+    nivel_perm = pd.DataFrame(
+        {
+            'pk_cid': registro.index.to_numpy(),
+            'numero_meses': mc,
+            'score': nvp,
+        }
+    )
 
-    return nivel_perm.reset_index(drop=True)
+    return nivel_perm
 
 def region_permanencia(nivel_permanencia):
     """
@@ -728,7 +1667,65 @@ def region_permanencia(nivel_permanencia):
 
     return nivel_permanencia['region_permanencia'].values
 
-def valorar_productos_clientes(df, lista_productos):
+def tensor_productos_clientes(df, lista_productos):
+    """
+    Pivota el dataset de productos en un array denso (clientes x meses x productos) de tipo int8.
+
+    El eje de meses recoge, en orden cronológico, únicamente los meses en los que el cliente aparece en el
+    registro. Las posiciones sin registro y los valores nulos se rellenan con -1.
+
+    Args:
+    -----
+    df [{pandas.DataFrame}] -- Dataset de productos.
+    lista_productos [{list}] -- Listado de productos.
+
+    Returns:
+    ------
+    clientes [{numpy.ndarray}] -- pk_cid de cada fila del tensor (ordenados).
+    num_months [{numpy.ndarray}] -- Número de meses que aparece cada cliente en el registro.
+    tensor [{numpy.ndarray}] -- Array int8 de dimensiones (clientes, meses, productos).
+    """
+    # Código entero de cliente (ordenado como en groupby('pk_cid'))
+    codigos, clientes = pd.factorize(df['pk_cid'], sort=True)
+    num_months = np.bincount(codigos, minlength=len(clientes))
+
+    # Ordenar filas por cliente y fecha de ingesta
+    orden = np.lexsort((df['pk_partition'].to_numpy(), codigos))
+    codigos = codigos[orden]
+
+    # Posición de cada fila dentro del historial de su cliente
+    inicio = np.cumsum(num_months) - num_months
+    posicion = np.arange(len(codigos)) - inicio[codigos]
+
+    # Estados de los productos (nulos -> -1), escritos producto a producto directamente en el tensor int8: los
+    # temporales no superan el tamaño de una columna
+    tensor = np.full((len(clientes), num_months.max(initial=0), len(lista_productos)), -1, dtype=np.int8)
+    for j, producto in enumerate(lista_productos):
+        tensor[codigos, posicion, j] = df[producto].fillna(-1).to_numpy(dtype=np.int8)[orden]
+
+    return np.asarray(clientes), num_months, tensor
+
+def racha_maxima(activo):
+    """
+    Longitud de la racha más larga de valores True consecutivos a lo largo del eje 1.
+
+    Args:
+    -----
+    activo [{numpy.ndarray}] -- Array booleano de dimensiones (clientes, meses).
+
+    Returns:
+    ------
+    racha [{numpy.ndarray}] -- Longitud máxima de racha por cliente.
+    """
+    acumulado = np.cumsum(activo, axis=1, dtype=np.int32)
+
+    # Valor acumulado en el último 0 anterior a cada posición
+    reinicio = np.where(activo, 0, acumulado)
+    np.maximum.accumulate(reinicio, axis=1, out=reinicio)
+
+    return (acumulado - reinicio).max(axis=1, initial=0)
+
+def valorar_productos_clientes(df, lista_productos, show_msg=True):
     """
     
     Función que permite valorar a los clientes en función de la relación que han mantenido con EasyMoney. A continuación, se 
@@ -739,131 +1736,156 @@ def valorar_productos_clientes(df, lista_productos):
         - 'product'. Producto analizado
         
         - 'num_months'. Número de meses que aparece en el registro.
+
+        - 'num_months_up'. Número de meses con el producto en estado igual a 1.
         
-        - 'max_permanence'. Máxima permanencia como cliente activo. Se define como la relación entre la longitud del número 
-                            máximo de veces que permanece con un estado igual a 1 sin tener ningún estado igual a 0 y el número
-                            de meses que permanece en el registro.
+        - 'max_permanence_ratio'. Máxima permanencia como cliente activo. Se define como la relación entre la longitud
+                                  del número máximo de veces que permanece con un estado igual a 1 sin tener ningún
+                                  estado igual a 0 y el número de meses que permanece en el registro.
         
         - 'permanence_ratio'. Ratio de permanencia. Se define como la relación entre el número de veces su estado es 1 y el 
                               número de meses que aparece en el registro.                            
                             
         - 'losses_ratio'. Ratio de perdida. Se define como el número de veces cuyo estado es 0 y el número de meses que aparece
                           en el registro (equivalente a 1-permanence_ratio)
+
+    El cálculo se realiza de forma vectorizada sobre el tensor (clientes x meses x productos) obtenido con
+    "tensor_productos_clientes", calculando las rachas de cada producto en una única pasada.
         
     Args:
     -----
     df [{pandas.DataFrame}] -- Dataset de productos.
-    producto [{str}] -- Producto a analizar (debe estar en la lista de productos).
     lista_productos [{list}] -- Listado de productos.
+    show_msg [{bool}] -- Mostrar mensaje de progreso.
     
     
     Returns:
     ------
-    resultado [{dict}] -- Diccionario con dos elementos:
-                            - p [{pandas.DataFrame}]. Dataset de productos almacenado con información adicional.
-                            
-                            - v [{list}]. Conjunto de valoraciones para cada producto (cada valoración por cada producto se 
-                                          representa con un pandas.DataFrame.
+    df_result [{pandas.DataFrame}] -- Valoración de cada cliente y producto.
     """
-    print('Valoración de clientes. Este proceso puede tomar un tiempo de espera largo...')
+    if show_msg:
+        print('Valoración de clientes...')
 
-    # Añadir información al dataset
-    products = df.copy() 
-    products['year'] = products['pk_partition'].dt.year # año de cada muestra
-        
-    # Cada fecha de ingesta tiene un valor asociado (0,16)
-    # Empaquetar valor de cada mes en un diccionario
-    k = pd.Series(products['pk_partition'].unique()).values
-    v = [x for x in range(0, len(k))]
-    d_values = dict(zip(k, v)) # Valor de los días
-    products['id_partition'] = products['pk_partition'].map(d_values)
-
-    # Inicialización de la variable de retorno.
-    resultado = {
-        'p': products, # Dataset con información adicional.
-        'v': list()
-    }
+    clientes, num_months, tensor = tensor_productos_clientes(df, lista_productos)
+    t = num_months[:, np.newaxis].astype(float)
 
-    # Calcular valoración de los clientes
-    # Inicialización dataframe resultado
-    val_clients = pd.DataFrame(
-        columns=[
-            'pk_cid','product', 'num_months', 'max_permanence', 'permanence_ratio', 'losses_ratio'
-        ]
-    )
+    # Número de meses con el producto activo (1) e inactivo (0)
+    num_months_up = (tensor == 1).sum(axis=1)
+    num_months_down = (tensor == 0).sum(axis=1)
 
-    # Calcular la valoración del cliente utilizando progress_apply para visualizar el progreso.
-    drop_columns = ['pk_partition','year','id_partition']
-    df = resultado['p'].drop(drop_columns, axis=1)
-    df_result = df.groupby('pk_cid').progress_apply(val_c, lista_productos=lista_productos)
+    # Racha máxima de meses consecutivos con el producto activo
+    max_permanence = np.empty_like(num_months_up)
+    for i in range(len(lista_productos)):
+        max_permanence[:, i] = racha_maxima(tensor[:, :, i] == 1)
 
-    df_result.reset_index(drop=True, inplace=True)
-    df_result.set_index(['pk_cid', 'product'])
+    max_permanence_ratio = max_permanence / t
+    losses_ratio = num_months_down / t
+    permanence_ratio = 1 - losses_ratio
+
+    # Clientes que nunca han tenido el producto activo
+    nunca_activo = num_months_down == num_months[:, np.newaxis]
+    losses_ratio[nunca_activo] = 0
+    permanence_ratio[nunca_activo] = 0
+
+    # Salida (una fila por cliente y producto)
+    df_result = pd.DataFrame(
+        {
+            'pk_cid': np.repeat(clientes, len(lista_productos)),
+            'product': np.tile(lista_productos, len(clientes)),
+            'num_months': np.repeat(num_months, len(lista_productos)),
+            'num_months_up': num_months_up.ravel(),
+            'max_permanence_ratio': max_permanence_ratio.ravel(),
+            'permanence_ratio': permanence_ratio.ravel(),
+            'losses_ratio': losses_ratio.ravel(),
+        }
+    )
 
     return df_result
 
-def val_c(historial_cliente, lista_productos):
+def shards_clientes(pk_cid, num_shards):
+    """
+    Asigna cada fila a un shard según el hash de su pk_cid: todas las filas de un cliente pertenecen al mismo shard y
+    la asignación es determinista (no depende del orden de las filas ni del proceso).
+
+    Args:
+    -----
+    pk_cid [{pandas.Series}] -- Identificador de cliente de cada fila.
+    num_shards [{int}] -- Número de shards.
+
+    Returns:
+    ------
+    shard [{numpy.ndarray}] -- Shard de cada fila.
+    """
+    return (pd.util.hash_pandas_object(pk_cid, index=False).to_numpy() % np.uint64(num_shards)).astype(np.int64)
+
+def _valorar_shard(df_shard, lista_productos):
+    """
+    Valoración de los clientes de un shard (se ejecuta en un proceso del pool). Devuelve la valoración y su duración.
+    """
+    inicio = time.perf_counter()
+    df_result = valorar_productos_clientes(df_shard, lista_productos, show_msg=False)
+
+    return df_result, time.perf_counter() - inicio
 
-    def tuplify(s, k):
-        return list(zip(*[s.values[i:].tolist() for i in range(k)]))
+def valorar_productos_clientes_paralelo(df, lista_productos, num_workers=None, num_shards=None, show_msg=True):
+    """
+    Valoración de los clientes (ver "valorar_productos_clientes") en paralelo. Los clientes se reparten en shards por
+    hash de su pk_cid y cada shard se valora en un proceso de un pool. Cada proceso recibe únicamente las filas de su
+    shard y las columnas necesarias (pk_cid, pk_partition y productos). Los resultados se unen de forma determinista:
+    la salida coincide con la de "valorar_productos_clientes" (clientes ordenados y productos en el orden de
+    "lista_productos").
 
-    # Identificar cliente
-    pk_cid = historial_cliente['pk_cid'].unique()[0]
-    t = historial_cliente.shape[0]  # Periodo. t = 17 meses
+    Args:
+    -----
+    df [{pandas.DataFrame}] -- Dataset de productos.
+    lista_productos [{list}] -- Listado de productos.
+    num_workers [{int}] -- Número de procesos (por defecto, número de CPUs).
+    num_shards [{int}] -- Número de shards (por defecto, num_workers).
+    show_msg [{bool}] -- Mostrar los tiempos de cada shard.
 
-    # Añadir cliente al resultado
-    val_cl = pd.DataFrame(
+    Returns:
+    ------
+    df_result [{pandas.DataFrame}] -- Valoración de cada cliente y producto.
+    tiempos [{pandas.DataFrame}] -- Número de clientes, filas y duración (segundos) de cada shard.
+    """
+    num_workers = num_workers or os.cpu_count()
+    num_shards = num_shards or num_workers
+
+    # Reparto de filas por shard: las filas se ordenan por shard una única vez (orden estable), de forma que las filas
+    # de cada shard ocupan un rango contiguo [limites[i], limites[i + 1]) (ver "indice_particiones")
+    shard = shards_clientes(df['pk_cid'], num_shards)
+    # Con claves de 16 bits numpy ordena por radix sort (lineal)
+    orden = np.argsort(shard.astype(np.uint16) if num_shards <= 1 << 16 else shard, kind='stable')
+    limites = np.zeros(num_shards + 1, dtype=np.int64)
+    np.cumsum(np.bincount(shard, minlength=num_shards), out=limites[1:])
+
+    # Proyección de columnas y una única copia ordenada (columna a columna, sin consolidar bloques); cada proceso
+    # recibe un rango de filas sin copias adicionales
+    columnas = ['pk_cid', 'pk_partition'] + list(lista_productos)
+    df_ordenado = pd.DataFrame({columna: df[columna].array.take(orden) for columna in columnas}, copy=False)
+    df_shards = [df_ordenado.iloc[limites[i]:limites[i + 1]] for i in range(num_shards)]
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        resultados = list(executor.map(_valorar_shard, df_shards, [lista_productos] * num_shards))
+
+    tiempos = pd.DataFrame(
         {
-            'pk_cid': np.repeat(pk_cid, len(lista_productos)),
-            'product': np.repeat(str, len(lista_productos)),
-            'num_months': np.repeat(np.nan, len(lista_productos)),
-            'num_months_up': np.repeat(np.nan, len(lista_productos)),
-            'max_permanence_ratio': np.repeat(np.nan, len(lista_productos)),
-            'permanence_ratio': np.repeat(np.nan, len(lista_productos)),
-            'losses_ratio': np.repeat(np.nan, len(lista_productos)),
-        }
+            'num_clientes': [df_shard['pk_cid'].nunique() for df_shard in df_shards],
+            'num_filas': [len(df_shard) for df_shard in df_shards],
+            'segundos': [segundos for _, segundos in resultados],
+        },
+        index=pd.RangeIndex(num_shards, name='shard')
     )
 
-    # Analizar al cliente
-    for i,p in enumerate(lista_productos):
-        # Almacenar producto
-        val_cl.at[i, 'product'] = p
-        historial_producto_cliente = historial_cliente[p]
-
-        if (historial_producto_cliente==1).all():
-            val_cl.at[i, 'num_months_up'] = t
-            val_cl.at[i, 'num_months'] = t
-            val_cl.at[i, 'max_permanence_ratio'] = 1
-            val_cl.at[i, 'losses_ratio'] = 0
-            val_cl.at[i, 'permanence_ratio'] = 1
-
-            continue
-
-        elif (historial_producto_cliente==0).all():
-            val_cl.at[i, 'num_months'] = t
-            val_cl.at[i, 'num_months_up'] = 0
-            val_cl.at[i, 'max_permanence_ratio'] = 0
-            val_cl.at[i, 'losses_ratio'] = 0
-            val_cl.at[i, 'permanence_ratio'] = 0
-            continue
-
-        else:
-            resultados = dict()
-            for k in range(1, t - 1):
-                resultados[k] = pd.value_counts(tuplify(historial_producto_cliente, k))
-                # Comprobar si existe la secuencia más favorable (todos unos)
-                if not tuple(np.repeat(1, k)) in resultados[k].index.to_list():
-                    # Si no existe la máxima pertenencia que ha tenido es k y se normaliza
-                    # con el número total de periodos que ha disfrutado
-                    val_cl.at[i, 'num_months'] = t
-                    val_cl.at[i, 'num_months_up'] = historial_producto_cliente[historial_producto_cliente==1].shape[0]
-                    val_cl.at[i, 'max_permanence_ratio'] = (k-1) / t
-                    val_cl.at[i, 'losses_ratio'] = historial_producto_cliente[historial_producto_cliente==0].shape[0]/t
-                    val_cl.at[i, 'permanence_ratio'] = 1-val_cl.iloc[i]['losses_ratio']
-
-                    break
-
-    return val_cl
+    # Unión determinista: clientes ordenados (orden estable, los productos mantienen el orden de lista_productos)
+    df_result = pd.concat([df_shard for df_shard, _ in resultados], ignore_index=True)
+    df_result = df_result.sort_values('pk_cid', kind='stable', ignore_index=True)
+
+    if show_msg:
+        print(f'Valoración de clientes ({num_shards} shards, {num_workers} procesos):')
+        print(tiempos.to_string())
+
+    return df_result, tiempos
 
 def get_valoracion_clientes(filename):
     """
@@ -0,0 +1,199 @@
+# Librerías
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+# Versión del formato de la caché (cambiar si cambia la forma de almacenar las columnas)
+VERSION_CACHE = 2
+
+def clave_fichero(filename_dir, usar_hash=False):
+    """
+    Calcula la clave de validez de la caché de un fichero a partir de su fecha de modificación y tamaño
+    (y opcionalmente del hash de su contenido).
+
+    Args:
+    -----
+    filename_dir [{str}] -- Directorio de almacenamiento incluyendo el nombre fichero.
+    usar_hash [{bool}] -- Si es True, incluye el hash sha1 del contenido (lectura completa del fichero).
+
+    Returns:
+    ------
+    clave [{dict}] -- Clave del fichero.
+    """
+    info = os.stat(filename_dir)
+    clave = {
+        'version': VERSION_CACHE,
+        'mtime_ns': info.st_mtime_ns,
+        'size': info.st_size,
+    }
+
+    if usar_hash:
+        sha1 = hashlib.sha1()
+        with open(filename_dir, 'rb') as f:
+            for bloque in iter(lambda: f.read(1 << 20), b''):
+                sha1.update(bloque)
+        clave['sha1'] = sha1.hexdigest()
+
+    return clave
+
+def directorio_cache(filename_dir, cache_dir):
+    """
+    Directorio de la caché de un fichero csv: <cache_dir>/<nombre del fichero sin extensión>-<hash de su ruta
+    absoluta>. Ficheros con el mismo nombre en directorios distintos no comparten caché.
+    """
+    nombre = os.path.splitext(os.path.basename(filename_dir))[0]
+    ruta_hash = hashlib.sha1(os.path.abspath(filename_dir).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(cache_dir, f'{nombre}-{ruta_hash}')
+
+def guardar_cache(df, directorio, clave):
+    """
+    Almacena un DataFrame en formato columnar: un fichero .npy por columna y un manifest.json con la clave
+    del fichero de origen y el tipo de cada columna. Las columnas de texto se almacenan como categóricas
+    (códigos + categorías). Si las categorías no son todas texto (p.ej. enteros y texto mezclados), se almacenan
+    como objetos de Python (pickle) para conservar su tipo.
+
+    Args:
+    -----
+    df [{pandas.DataFrame}] -- DataFrame a almacenar.
+    directorio [{str}] -- Directorio de la caché.
+    clave [{dict}] -- Clave del fichero de origen (ver "clave_fichero").
+
+    Returns:
+    ------
+    df [{pandas.DataFrame}] -- DataFrame con las columnas de texto convertidas a categóricas.
+    """
+    os.makedirs(directorio, exist_ok=True)
+
+    # Invalidar la caché anterior antes de sobrescribir las columnas
+    manifest_dir = os.path.join(directorio, 'manifest.json')
+    if os.path.exists(manifest_dir):
+        os.remove(manifest_dir)
+
+    columnas = []
+    for i, col_name in enumerate(df.columns):
+        columna = df[col_name]
+        fichero = f'{i}.npy'
+
+        if columna.dtype == object or isinstance(columna.dtype, pd.CategoricalDtype):
+            columna = columna.astype('category')
+            df[col_name] = columna
+            np.save(os.path.join(directorio, fichero), columna.cat.codes.to_numpy())
+
+            # Categorías de texto como array de texto; cualquier otro tipo se conserva como objeto
+            categorias = columna.cat.categories
+            tipo_categorias = 'str' if pd.api.types.infer_dtype(categorias, skipna=False) == 'string' else 'object'
+            categorias = categorias.to_numpy().astype(str if tipo_categorias == 'str' else object)
+            np.save(os.path.join(directorio, f'{i}.categories.npy'), categorias,
+                    allow_pickle=tipo_categorias == 'object')
+            columnas.append({'name': col_name, 'file': fichero, 'dtype': 'category', 'categories': tipo_categorias})
+        else:
+            np.save(os.path.join(directorio, fichero), columna.to_numpy())
+            columnas.append({'name': col_name, 'file': fichero, 'dtype': str(columna.dtype)})
+
+    # El manifest se escribe en último lugar: si falta, la caché no es válida.
+    with open(manifest_dir, 'w', encoding='utf-8') as f:
+        json.dump({'clave': clave, 'columnas': columnas}, f)
+
+    return df
+
+def leer_cache(directorio, clave):
+    """
+    Lee un DataFrame almacenado con "guardar_cache". Las columnas se abren con memory-mapping copy-on-write: el
+    DataFrame admite escrituras (como si se hubiera leído del csv), que solo modifican la copia en memoria del
+    proceso y nunca los ficheros de la caché.
+
+    Args:
+    -----
+    directorio [{str}] -- Directorio de la caché.
+    clave [{dict}] -- Clave actual del fichero de origen.
+
+    Returns:
+    ------
+    df [{pandas.DataFrame}] -- DataFrame almacenado o None si la caché no existe o no es válida.
+    """
+    manifest_dir = os.path.join(directorio, 'manifest.json')
+    if not os.path.exists(manifest_dir):
+        return None
+
+    with open(manifest_dir, encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if manifest['clave'] != clave:
+        return None
+
+    datos = dict()
+    for columna in manifest['columnas']:
+        valores = np.load(os.path.join(directorio, columna['file']), mmap_mode='c')
+
+        if columna['dtype'] == 'category':
+            categorias = np.load(os.path.join(directorio, columna['file'].replace('.npy', '.categories.npy')),
+                                 allow_pickle=columna['categories'] == 'object')
+            valores = pd.Categorical.from_codes(valores, categories=categorias)
+
+        datos[columna['name']] = valores
+
+    return pd.DataFrame(datos, copy=False)
+
+def cargar_con_cache(filename_dir, cache_dir, cargar, usar_hash=False):
+    """
+    Carga un fichero csv utilizando la caché columnar. Si la caché no existe o el fichero ha cambiado
+    (fecha de modificación, tamaño u opcionalmente hash), se carga con la función "cargar" y se
+    regenera la caché.
+
+    Args:
+    -----
+    filename_dir [{str}] -- Directorio de almacenamiento incluyendo el nombre fichero.
+    cache_dir [{str}] -- Directorio raíz de la caché.
+    cargar [{function}] -- Función de carga del csv (p.ej. "get_products_df").
+    usar_hash [{bool}] -- Incluir el hash del contenido en la clave de validez.
+
+    Returns:
+    ------
+    df [{pandas.DataFrame}] -- Fichero cargado en formato DataFrame.
+    """
+    clave = clave_fichero(filename_dir, usar_hash=usar_hash)
+    directorio = directorio_cache(filename_dir, cache_dir)
+
+    df = leer_cache(directorio, clave)
+    if df is None:
+        df = guardar_cache(cargar(filename_dir), directorio, clave)
+
+    return df
+
+def cargar_json_con_cache(filename_dir, cache_dir, nombre, calcular, parametros=None, usar_hash=False):
+    """
+    Carga un resultado derivado de un fichero csv (p.ej. su perfil, ver "analisis.perfilar_csv") almacenado en
+    formato JSON junto a la caché columnar del fichero: <cache_dir>/<nombre del fichero>/<nombre>.json. Si no
+    existe, el fichero ha cambiado o los parámetros son distintos, se calcula con la función "calcular".
+
+    Args:
+    -----
+    filename_dir [{str}] -- Directorio de almacenamiento incluyendo el nombre fichero.
+    cache_dir [{str}] -- Directorio raíz de la caché.
+    nombre [{str}] -- Nombre del resultado.
+    calcular [{function}] -- Función que calcula el resultado a partir del fichero (debe ser serializable a JSON).
+    parametros [{dict}] -- Parámetros del cálculo (forman parte de la clave de validez).
+    usar_hash [{bool}] -- Incluir el hash del contenido en la clave de validez.
+
+    Returns:
+    ------
+    resultado [{dict}] -- Resultado calculado o almacenado.
+    """
+    clave = {'fichero': clave_fichero(filename_dir, usar_hash=usar_hash), 'parametros': parametros}
+    directorio = directorio_cache(filename_dir, cache_dir)
+    resultado_dir = os.path.join(directorio, f'{nombre}.json')
+
+    if os.path.exists(resultado_dir):
+        with open(resultado_dir, encoding='utf-8') as f:
+            almacenado = json.load(f)
+        if almacenado['clave'] == clave:
+            return almacenado['resultado']
+
+    resultado = calcular(filename_dir)
+    os.makedirs(directorio, exist_ok=True)
+    with open(resultado_dir, 'w', encoding='utf-8') as f:
+        json.dump({'clave': clave, 'resultado': resultado}, f, ensure_ascii=False)
+
+    return resultado
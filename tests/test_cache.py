@@ -0,0 +1,45 @@
+"""
+Pruebas de la caché columnar (modules/cache.py).
+
+Uso (desde la raíz del repositorio):
+    python -m pytest -q tests
+"""
+# Librerías
+import numpy as np
+import pandas as pd
+
+# Paquetes
+from modules import analisis as anl
+
+
+def escribir_products_csv(filename):
+    """ Fichero products_df.csv mínimo (con valores nulos en payroll). """
+    df = pd.DataFrame({
+        'pk_cid': ['15001', '15002', '15001', '15002'],
+        'pk_partition': ['2018-01-28', '2018-01-28', '2018-02-28', '2018-02-28'],
+        **{producto: [0.0, 1.0, 1.0, 0.0] for producto in anl.LISTA_PRODUCTOS},
+    })
+    df['payroll'] = [np.nan, 1.0, np.nan, 0.0]
+    df.rename({'em_account': 'em_acount'}, axis=1).to_csv(filename)
+
+
+def test_cache_admite_escrituras(tmp_path):
+    filename = str(tmp_path / 'products_df.csv')
+    cache_dir = str(tmp_path / 'cache')
+    escribir_products_csv(filename)
+
+    sin_cache = anl.get_products_df(filename)
+    anl.get_products_df(filename, cache_dir=cache_dir)
+    df_prod = anl.get_products_df(filename, cache_dir=cache_dir)  # Caché caliente (memory-mapping)
+
+    # Escrituras in-place (p.ej. relleno de nulos con .loc, como "nulos_productos")
+    df_prod.loc[df_prod['payroll'].isna(), 'payroll'] = 0
+    df_prod.iloc[0, 2] = 1.0
+    df_prod['loans'].values[:] += 1
+
+    assert df_prod['payroll'].tolist() == [0.0, 1.0, 0.0, 0.0]
+    assert df_prod.iloc[0, 2] == 1.0
+
+    # Las escrituras no modifican los ficheros de la caché
+    pd.testing.assert_frame_equal(anl.get_products_df(filename, cache_dir=cache_dir), sin_cache,
+                                  check_categorical=False, check_dtype=False)